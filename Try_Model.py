@@ -9,7 +9,12 @@ from sklearn.ensemble import RandomForestClassifier, AdaBoostClassifier
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 from sklearn.feature_extraction.text import TfidfVectorizer
-from imblearn.over_sampling import RandomOverSampler
+from features import oversample_sparse
+from artifacts import artifact_cache, dataset_hash
+from sklearn.pipeline import Pipeline
+import model_registry
+from linear_svm import build_linear_svm, CalibratedLinearSVC
+from knn import CosineKNN
 
 st.set_page_config(page_title="Dashboard Analisis Sentimen", layout="wide")
 
@@ -17,9 +22,13 @@ def train_model(model_name, X_train, X_test, y_train, y_test):
     models = {
         'Naive Bayes': MultinomialNB(),
         'SVM': SVC(probability=True),
+        'SVM Linear': build_linear_svm(),
+        'SVM Linear (Kalibrasi)': CalibratedLinearSVC(),
         'Random Forest': RandomForestClassifier(),
         'AdaBoost': AdaBoostClassifier(),
         'KNN': KNeighborsClassifier(),
+        'KNN Cosine': CosineKNN(),
+        'KNN SVD': CosineKNN(mode='svd'),
     }
 
     model = models.get(model_name)
@@ -31,7 +40,36 @@ def train_model(model_name, X_train, X_test, y_train, y_test):
     recall = recall_score(y_test, y_pred, average='weighted')
     f1 = f1_score(y_test, y_pred, average='weighted')
 
-    return accuracy, precision, recall, f1, y_pred
+    return accuracy, precision, recall, f1, y_pred, model
+
+@st.cache_data
+def load_data(uploaded_file):
+    file_extension = uploaded_file.name.split('.')[-1]
+    if file_extension == "csv":
+        return pd.read_csv(uploaded_file)
+    elif file_extension == "xlsx":
+        return pd.read_excel(uploaded_file)
+    elif file_extension == "json":
+        return pd.read_json(uploaded_file)
+    return None
+
+def vectorize(X):
+    vectorizer = TfidfVectorizer()
+    return vectorizer, vectorizer.fit_transform(X)
+
+def split_features(X_tfidf, y, test_size):
+    X_train, X_test, y_train, y_test = train_test_split(X_tfidf, y, test_size=test_size / 100, random_state=42)
+    X_train, y_train = oversample_sparse(X_train, y_train, random_state=42)
+    return X_train, X_test, y_train, y_test
+
+def prepare_features(X, y, test_size, data_key):
+    # Tahap dijalankan hanya jika input-nya berubah: TF-IDF per dataset (tidak bergantung
+    # pada ukuran data uji), split + oversampling per (dataset, ukuran data uji)
+    vectorizer, X_tfidf = artifact_cache.get_or_build(("try-tfidf", data_key), lambda: vectorize(X))
+    split = artifact_cache.get_or_build(
+        ("try-features", data_key, test_size), lambda: split_features(X_tfidf, y, test_size)
+    )
+    return (vectorizer, *split)
 
 def display_header():
     st.markdown("""
@@ -47,21 +85,15 @@ def show():
     with st.sidebar:
         st.title("Navigasi")
         st.markdown("Pilih model dan parameter:")
-        selected_model = st.selectbox("Pilih Model", ["Naive Bayes", "SVM", "Random Forest", "AdaBoost", "KNN"])
+        selected_model = st.selectbox("Pilih Model", ["Naive Bayes", "SVM", "SVM Linear", "SVM Linear (Kalibrasi)", "Random Forest", "AdaBoost", "KNN", "KNN Cosine", "KNN SVD"])
         test_size = st.slider("Ukuran Data Uji (%)", 10, 50, 20)
+        save_to_registry = st.checkbox("💾 Simpan model ke registry")
 
     uploaded_file = st.file_uploader("Unggah dataset (CSV, Excel, JSON)", type=["csv", "xlsx", "json"])
 
     if uploaded_file:
-        file_extension = uploaded_file.name.split('.')[-1]
-
-        if file_extension == "csv":
-            data = pd.read_csv(uploaded_file)
-        elif file_extension == "xlsx":
-            data = pd.read_excel(uploaded_file)
-        elif file_extension == "json":
-            data = pd.read_json(uploaded_file)
-        else:
+        data = load_data(uploaded_file)
+        if data is None:
             st.error("Format file tidak didukung.")
             return
 
@@ -71,20 +103,36 @@ def show():
             with st.expander("Pratinjau Dataset"):
                 st.write(data.head())
 
-            X = data['Komentar'].fillna("")
-            y = data['Label']
-            vectorizer = TfidfVectorizer()
-            X_tfidf = vectorizer.fit_transform(X)
-
-            X_train, X_test, y_train, y_test = train_test_split(X_tfidf, y, test_size=test_size / 100, random_state=42)
-            ros = RandomOverSampler(random_state=42)
-            X_train, y_train = ros.fit_resample(X_train, y_train)
-
             if st.button("Latih Model"):
+                # Vektorisasi, split dan oversampling baru dihitung saat tombol ditekan, dan
+                # hasilnya dipakai ulang selama dataset dan ukuran data uji tidak berubah
+                X = data['Komentar'].fillna("")
+                y = data['Label']
+                data_key = dataset_hash(X, y)
+                features_key = ("try-features", data_key, test_size)
+                with st.spinner("Menyiapkan fitur..."):
+                    vectorizer, X_train, X_test, y_train, y_test = prepare_features(X, y, test_size, data_key)
+
                 with st.spinner("Melatih model..."):
-                    accuracy, precision, recall, f1, y_pred = train_model(selected_model, X_train, X_test, y_train, y_test)
+                    accuracy, precision, recall, f1, y_pred, model = artifact_cache.get_or_build(
+                        (features_key, selected_model),
+                        lambda: train_model(selected_model, X_train, X_test, y_train, y_test)
+                    )
 
                 st.success("Model selesai dilatih!")
+
+                if save_to_registry:
+                    try:
+                        metadata = model_registry.save_model(
+                            selected_model,
+                            Pipeline([("tfidf", vectorizer), ("model", model)]),
+                            data_key,
+                            metrics={"Akurasi": accuracy, "Precision": precision, "Recall": recall, "F1-Score": f1},
+                            params={"page": "try_model", "test_size": test_size / 100, "random_state": 42},
+                        )
+                        st.info(f"💾 Tersimpan di registry: {selected_model} versi {metadata['version']}")
+                    except Exception as e:
+                        st.error(f"Gagal menyimpan model: {e}")
                 st.markdown(f"### Hasil Evaluasi Model: {selected_model}")
                 metrics = {
                     "Akurasi": accuracy,
@@ -0,0 +1,97 @@
+import hashlib
+import pickle
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from features import matrix_bytes
+
+DEFAULT_MAX_ENTRIES = 8
+DEFAULT_MAX_BYTES = 1024 ** 3
+
+
+def dataset_hash(*columns):
+    # Sidik isi dataset (komentar + label), tidak bergantung pada nama file atau index
+    h = hashlib.sha1()
+    for column in columns:
+        h.update(pd.util.hash_pandas_object(column, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def artifact_bytes(value):
+    # Perkiraan ukuran: matriks sparse/ndarray dihitung langsung, objek lain lewat pickle
+    if isinstance(value, dict):
+        return sum(artifact_bytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(artifact_bytes(v) for v in value)
+    if sparse.issparse(value) or isinstance(value, np.ndarray):
+        return matrix_bytes(value)
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+class ArtifactCache:
+    # Cache tingkat proses untuk vectorizer, matriks fitur dan model terlatih,
+    # dengan kunci (hash dataset, parameter). Entri paling lama tidak dipakai
+    # dibuang jika jumlah entri atau total ukuran melebihi batas.
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, nbytes=None):
+        nbytes = artifact_bytes(value) if nbytes is None else nbytes
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self._bytes += nbytes
+            # Entri terbaru selalu dipertahankan walaupun melebihi batas ukuran
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, (_, size) = self._entries.popitem(last=False)
+                self._bytes -= size
+        return value
+
+    def get_or_build(self, key, build):
+        # build() boleh mengembalikan None (mis. gagal dan sudah menampilkan error); tidak disimpan
+        value = self.get(key)
+        if value is None:
+            value = build()
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes}
+
+    def __len__(self):
+        return len(self._entries)
+
+
+artifact_cache = ArtifactCache()
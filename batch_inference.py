@@ -0,0 +1,247 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import model_registry
+from preprocesing import run_preprocessing, find_text_column, _source_size
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+DEFAULT_CHUNK_SIZE = 50_000
+# Ukuran batch prediksi di dalam satu chunk; membatasi memori KNN/SVM saat menghitung jarak/kernel
+PREDICT_BATCH_SIZE = 5_000
+LABEL_COLUMN = "Prediksi"
+
+
+def _file_format(path):
+    return "parquet" if str(path).lower().endswith((".parquet", ".pq")) else "csv"
+
+
+def iter_chunks(source, fmt, chunk_size=DEFAULT_CHUNK_SIZE, columns=None):
+    if fmt == "parquet":
+        if pq is None:
+            raise ImportError("Membaca Parquet memerlukan paket 'pyarrow'.")
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(source, chunksize=chunk_size, usecols=columns)
+
+
+def read_preview(path, fmt, rows=100):
+    if fmt == "parquet":
+        return next(iter_chunks(path, fmt, rows), pd.DataFrame())
+    return pd.read_csv(path, nrows=rows)
+
+
+class _ChunkWriter:
+    # Menulis hasil per chunk ke CSV (append) atau Parquet (satu row group per chunk)
+    def __init__(self, path):
+        self.path = path
+        self.fmt = _file_format(path)
+        self._writer = None
+        self._file = None
+
+    def write(self, chunk):
+        if self.fmt == "parquet":
+            if pq is None:
+                raise ImportError("Menulis Parquet memerlukan paket 'pyarrow'.")
+            if self._writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            else:
+                table = pa.Table.from_pandas(chunk, schema=self._writer.schema, preserve_index=False)
+            self._writer.write_table(table)
+        else:
+            header = self._file is None
+            if self._file is None:
+                self._file = open(self.path, "w", encoding="utf-8", newline="")
+            chunk.to_csv(self._file, header=header, index=False)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+
+
+def predict_texts(pipeline, texts, batch_size=PREDICT_BATCH_SIZE):
+    # Mengembalikan (label, probabilitas atau None); TF-IDF tetap sparse per batch
+    labels, probas = [], []
+    has_proba = hasattr(pipeline, "predict_proba")
+    for start in range(0, len(texts), batch_size):
+        batch = pipeline[:-1].transform(texts[start:start + batch_size])
+        labels.append(pipeline[-1].predict(batch))
+        if has_proba:
+            probas.append(pipeline[-1].predict_proba(batch))
+    if not labels:
+        return np.array([]), None
+    return np.concatenate(labels), (np.vstack(probas) if has_proba else None)
+
+
+def predict_file(source, output_path, pipeline, cleaner_args, text_col=None,
+                 chunk_size=DEFAULT_CHUNK_SIZE, fmt=None, progress=None):
+    # Sumber dibaca per chunk, dibersihkan dengan preprocessing yang sama seperti
+    # clean_text, diprediksi lalu langsung ditulis; memori puncak bergantung pada chunk_size
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return predict_file(f, output_path, pipeline, cleaner_args, text_col, chunk_size,
+                                fmt or _file_format(source), progress)
+
+    fmt = fmt or _file_format(getattr(source, "name", ""))
+    total_bytes = _source_size(source)
+    classes = list(getattr(pipeline, "classes_", []))
+    stats = {"rows": 0, "chunks": 0, "clean_seconds": 0.0, "predict_seconds": 0.0}
+    start = time.perf_counter()
+    writer = _ChunkWriter(output_path)
+    try:
+        for chunk in iter_chunks(source, fmt, chunk_size):
+            if text_col is None:
+                text_col = find_text_column(chunk)
+                if text_col is None:
+                    raise ValueError("Tidak ditemukan kolom teks dalam dataset.")
+
+            t = time.perf_counter()
+            cleaned, _, _ = run_preprocessing(chunk[text_col], cleaner_args, use_cache=False)
+            stats["clean_seconds"] += time.perf_counter() - t
+
+            t = time.perf_counter()
+            labels, proba = predict_texts(pipeline, cleaned.tolist())
+            stats["predict_seconds"] += time.perf_counter() - t
+
+            chunk[LABEL_COLUMN] = labels
+            if proba is not None:
+                for i, label in enumerate(classes):
+                    chunk[f"Probabilitas {label}"] = proba[:, i]
+            writer.write(chunk)
+
+            stats["rows"] += len(chunk)
+            stats["chunks"] += 1
+            if progress is not None:
+                fraction = None
+                if fmt == "csv" and total_bytes:
+                    fraction = min(source.tell() / total_bytes, 1.0)
+                elapsed = time.perf_counter() - start
+                progress(stats["chunks"], stats["rows"], stats["rows"] / elapsed if elapsed else 0.0, fraction)
+    finally:
+        writer.close()
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["rows_per_sec"] = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+    stats["text_column"] = text_col
+    return stats
+
+
+def _model_label(metadata):
+    accuracy = metadata.get("metrics", {}).get("Akurasi")
+    score = f", akurasi {accuracy:.2%}" if isinstance(accuracy, (int, float)) else ""
+    return f"{metadata['name']} v{metadata['version']}{score} ({metadata.get('created_at', '-')})"
+
+
+def show():
+    st.title("🔮 Prediksi Batch")
+    st.markdown("Labeli komentar baru (CSV/Parquet) dengan model yang tersimpan di registry.")
+
+    models = model_registry.list_models()
+    if not models:
+        st.info("Belum ada model di registry. Latih dan simpan model di halaman Modeling.")
+        return
+
+    choice = st.selectbox("Pilih Model", range(len(models)), format_func=lambda i: _model_label(models[i]))
+    metadata = models[choice]
+
+    uploaded_file = st.file_uploader("📂 Unggah Komentar Baru (CSV/Parquet)", type=["csv", "parquet"])
+    if uploaded_file is None:
+        return
+
+    st.sidebar.header("⚙️ Pengaturan Prediksi")
+    auto_stop = st.sidebar.checkbox("Stopword Otomatis")
+    auto_stem = st.sidebar.checkbox("Stemming Otomatis")
+    chunk_size = st.sidebar.number_input("Baris per Chunk", min_value=1000, value=DEFAULT_CHUNK_SIZE, step=1000)
+    cleaner_args = ([], False, {}, auto_stop, auto_stem)
+
+    if st.button("🔮 Jalankan Prediksi"):
+        try:
+            pipeline, _ = model_registry.load_model(metadata["name"], metadata["version"])
+        except Exception as e:
+            st.error(f"❌ Gagal memuat model: {e}")
+            return
+
+        fmt = _file_format(uploaded_file.name)
+        old_path = st.session_state.get("prediction_output")
+        if old_path and os.path.exists(old_path):
+            os.remove(old_path)
+        with tempfile.NamedTemporaryFile(prefix="sentilab_pred_", suffix=f".{fmt}", delete=False) as tmp:
+            output_path = tmp.name
+        st.session_state.prediction_output = output_path
+
+        bar = st.progress(0.0, text="Memulai prediksi...")
+
+        def report(chunk_no, rows, rows_per_sec, fraction):
+            bar.progress(fraction if fraction is not None else 0.0,
+                         text=f"Chunk {chunk_no}: {rows:,} baris ({rows_per_sec:,.0f} baris/detik)")
+
+        try:
+            uploaded_file.seek(0)
+            stats = predict_file(uploaded_file, output_path, pipeline, cleaner_args,
+                                 chunk_size=int(chunk_size), fmt=fmt, progress=report)
+        except Exception as e:
+            st.error(f"❌ Terjadi kesalahan saat prediksi: {e}")
+            return
+        bar.progress(1.0, text=f"Selesai: {stats['rows']:,} baris diprediksi.")
+        st.success(
+            f"✅ {stats['rows']:,} baris dalam {stats['seconds']:.1f} detik "
+            f"({stats['rows_per_sec']:,.0f} baris/detik; preprocessing {stats['clean_seconds']:.1f} dtk, "
+            f"prediksi {stats['predict_seconds']:.1f} dtk)."
+        )
+
+    output_path = st.session_state.get("prediction_output")
+    if output_path and os.path.exists(output_path):
+        fmt = _file_format(output_path)
+        st.subheader("✅ Hasil Prediksi")
+        st.dataframe(read_preview(output_path, fmt), use_container_width=True)
+        st.caption("Pratinjau 100 baris pertama.")
+        with open(output_path, "rb") as f:
+            st.download_button(
+                label="💾 Unduh Hasil Prediksi",
+                data=f,
+                file_name=f"hasil_prediksi.{fmt}",
+                mime="application/octet-stream" if fmt == "parquet" else "text/csv"
+            )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prediksi batch komentar dengan model dari registry SENTILAB")
+    parser.add_argument("--model", required=True, help="Nama model di registry, mis. 'Naive Bayes'")
+    parser.add_argument("--version", type=int, help="Versi model (default: terbaru)")
+    parser.add_argument("--input", required=True, help="File CSV/Parquet berisi komentar")
+    parser.add_argument("--output", required=True, help="File hasil (.csv atau .parquet)")
+    parser.add_argument("--text-column", help="Nama kolom komentar (default: kolom teks pertama)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--auto-stopwords", action="store_true")
+    parser.add_argument("--auto-stemming", action="store_true")
+    parser.add_argument("--registry", default=model_registry.REGISTRY_DIR)
+    args = parser.parse_args(argv)
+
+    pipeline, metadata = model_registry.load_model(args.model, args.version, registry_dir=args.registry)
+    cleaner_args = ([], False, {}, args.auto_stopwords, args.auto_stemming)
+
+    def report(chunk_no, rows, rows_per_sec, fraction):
+        print(f"chunk {chunk_no}: {rows:,} baris ({rows_per_sec:,.0f} baris/detik)", flush=True)
+
+    stats = predict_file(args.input, args.output, pipeline, cleaner_args, args.text_column,
+                         args.chunk_size, progress=report)
+    print(f"{metadata['name']} v{metadata['version']}: {stats['rows']:,} baris dalam {stats['seconds']:.2f} detik "
+          f"({stats['rows_per_sec']:,.0f} baris/detik) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+import resources
+from benchmarks.harness import metadata, write_report
+from benchmarks.synthetic import generate_comments
+from features import share_csr, attach_csr, release, matrix_stats
+from lexicon import LexiconIndex
+from telemetry import rss_mb
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+DEFAULT_MAX_SECONDS = 600.0
+DEFAULT_MAX_MEMORY_MB = 4096.0
+POLL_INTERVAL = 0.1
+# Nama baris hasil untuk tahap TF-IDF + oversampling jika tahap itu melewati anggaran
+FEATURE_STAGE = "TF-IDF + oversampling"
+
+
+def app_models():
+    # Semua classifier yang bisa dipilih di halaman Modeling, termasuk varian SVM dan KNN
+    import modeling
+    names = modeling.MODEL_NAMES + list(modeling.SVM_VARIANTS.values()) + list(modeling.KNN_VARIANTS.values())
+    return list(dict.fromkeys(names))
+
+
+def load_dataset(size, seed, data_path=None):
+    # Sampel dari dataset berlabel (kolom Komentar/Label) jika diberikan; jika tidak,
+    # komentar sintetis dilabeli dengan kamus lexicon seperti di halaman Labeling
+    if data_path:
+        data = pd.read_csv(data_path, usecols=["Komentar", "Label"]).dropna(subset=["Label"])
+        sample = data.sample(n=size, replace=size > len(data), random_state=seed)
+        return sample["Komentar"].fillna("").astype(str).reset_index(drop=True), sample["Label"].reset_index(drop=True)
+    lexicon = LexiconIndex(
+        resources.load_words(resources.POSITIVE_PATH), resources.load_words(resources.NEGATIVE_PATH)
+    )
+    texts = generate_comments(size, seed=seed).str.lower()
+    return texts, lexicon.label_series(texts)["Label"]
+
+
+def _features_child(size, seed, data_path, directory, conn):
+    # Data dimuat dan fitur disiapkan di proses terpisah; hasilnya ditulis ke directory
+    import modeling
+    conn.send({"status": "ready"})
+    try:
+        texts, labels = load_dataset(size, seed, data_path)
+        features = modeling.prepare_features(texts, labels)
+        if features is None:
+            raise RuntimeError(f"Gagal menyiapkan fitur untuk {size} baris")
+        for name in ("X_train", "X_test"):
+            sparse.save_npz(os.path.join(directory, f"{name}.npz"), features[name], compressed=False)
+        for name in ("y_train", "y_test"):
+            np.save(os.path.join(directory, f"{name}.npy"), np.asarray(features[name]), allow_pickle=True)
+        conn.send({
+            "status": "ok",
+            "stats": matrix_stats(features["X_train"], "Latih"),
+            "telemetry": features["telemetry"],
+        })
+    except Exception as e:
+        conn.send({"status": "error", "error": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+def _load_features(directory):
+    X_train, X_test = (sparse.load_npz(os.path.join(directory, f"{name}.npz")).tocsr() for name in ("X_train", "X_test"))
+    y_train, y_test = (np.load(os.path.join(directory, f"{name}.npy"), allow_pickle=True) for name in ("y_train", "y_test"))
+    return X_train, X_test, y_train, y_test
+
+
+def _child(model_name, train_spec, test_spec, y_train, y_test, conn):
+    # Dijalankan di proses terpisah agar konfigurasi yang melewati anggaran bisa dihentikan
+    import modeling
+    train_blocks, X_train = attach_csr(train_spec)
+    test_blocks, X_test = attach_csr(test_spec)
+    conn.send({"status": "ready"})
+    try:
+        start = time.perf_counter()
+        _, scores, telemetry = modeling._fit_and_score(model_name, X_train, X_test, y_train, y_test, n_jobs=1)
+        conn.send({"status": "ok", "wall_seconds": time.perf_counter() - start, "scores": scores, "telemetry": telemetry})
+    except Exception as e:
+        conn.send({"status": "error", "error": f"{type(e).__name__}: {e}"})
+    finally:
+        del X_train, X_test
+        for block in train_blocks + test_blocks:
+            block.close()
+        conn.close()
+
+
+def _process_rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _supervise(target, args, max_seconds, max_memory_mb):
+    # Proses anak diawasi: dihentikan jika melewati batas waktu atau RSS-nya melewati batas memori.
+    # Batas waktu dihitung sejak anak mengirim "ready" (impor modul tidak ikut dihitung)
+    context = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = context.Pipe(duplex=False)
+    process = context.Process(target=target, args=(*args, child_conn))
+    start = time.perf_counter()
+    process.start()
+    child_conn.close()
+
+    peak_rss, outcome, startup = 0.0, None, None
+    while outcome is None:
+        if parent_conn.poll(POLL_INTERVAL):
+            try:
+                message = parent_conn.recv()
+            except EOFError:
+                outcome = {"status": "error", "error": f"proses berhenti (exit code {process.exitcode})"}
+                break
+            if message["status"] == "ready":
+                startup = time.perf_counter() - start
+                start = time.perf_counter()
+                continue
+            outcome = message
+            break
+        rss = _process_rss_mb(process.pid)
+        if rss is not None:
+            peak_rss = max(peak_rss, rss)
+        elapsed = time.perf_counter() - start
+        if max_memory_mb and peak_rss > max_memory_mb:
+            outcome = {"status": "over_memory", "error": f"RSS {peak_rss:.0f} MB > batas {max_memory_mb:.0f} MB"}
+        elif max_seconds and elapsed > max_seconds:
+            outcome = {"status": "timeout", "error": f"melewati batas {max_seconds:.0f} detik"}
+        elif not process.is_alive() and not parent_conn.poll():
+            outcome = {"status": "error", "error": f"proses berhenti (exit code {process.exitcode})"}
+
+    if process.is_alive() and outcome["status"] != "ok":
+        process.terminate()
+    process.join()
+    parent_conn.close()
+    outcome["elapsed_seconds"] = time.perf_counter() - start
+    outcome["startup_seconds"] = startup
+    outcome["sampled_peak_rss_mb"] = peak_rss or None
+    return outcome
+
+
+def run_features(size, seed, data_path, directory, max_seconds, max_memory_mb):
+    return _supervise(_features_child, (size, seed, data_path, directory), max_seconds, max_memory_mb)
+
+
+def run_model(model_name, train_spec, test_spec, y_train, y_test, max_seconds, max_memory_mb):
+    return _supervise(_child, (model_name, train_spec, test_spec, y_train, y_test), max_seconds, max_memory_mb)
+
+
+def run(sizes, model_names, seed=42, data_path=None, max_seconds=DEFAULT_MAX_SECONDS,
+        max_memory_mb=DEFAULT_MAX_MEMORY_MB, progress=None):
+    # Tahap fitur (muat data, TF-IDF, split, oversampling) juga berjalan di proses anak dengan
+    # anggaran yang sama; jika gagal, ukuran itu dilaporkan gagal dan ukuran berikutnya tetap jalan
+    stages, results = [], []
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix="bench_modeling_") as directory:
+            outcome = run_features(size, seed, data_path, directory, max_seconds, max_memory_mb)
+            stages.append({
+                "rows": size,
+                "stage": "features",
+                "status": outcome["status"],
+                "wall_seconds": round(outcome["elapsed_seconds"], 3),
+                "peak_rss_mb": round(outcome["sampled_peak_rss_mb"], 1) if outcome["sampled_peak_rss_mb"] else None,
+            })
+            if outcome["status"] != "ok":
+                row = {
+                    "rows": size,
+                    "model": FEATURE_STAGE,
+                    "status": outcome["status"],
+                    "wall_seconds": round(outcome["elapsed_seconds"], 3),
+                    "peak_rss_mb": stages[-1]["peak_rss_mb"],
+                    "error": outcome.get("error"),
+                }
+                results.append(row)
+                if progress is not None:
+                    progress(row)
+                continue
+            stats = outcome["stats"]
+            for stage, values in outcome["telemetry"].items():
+                stages.append({"rows": size, "stage": stage, **values})
+            X_train, X_test, y_train, y_test = _load_features(directory)
+
+        train_blocks, train_spec = share_csr(X_train)
+        test_blocks, test_spec = share_csr(X_test)
+        del X_train, X_test
+        try:
+            for name in model_names:
+                outcome = run_model(name, train_spec, test_spec, y_train, y_test, max_seconds, max_memory_mb)
+                telemetry = outcome.get("telemetry", {})
+                fit, predict = telemetry.get("fit", {}), telemetry.get("predict", {})
+                scores = outcome.get("scores") or (None,) * 4
+                peaks = [v for v in (fit.get("rss_peak_mb"), predict.get("rss_peak_mb"), outcome["sampled_peak_rss_mb"]) if v]
+                row = {
+                    "rows": size,
+                    "train_rows": stats["Baris"],
+                    "features": stats["Fitur"],
+                    "model": name,
+                    "status": outcome["status"],
+                    "wall_seconds": round(outcome["elapsed_seconds"], 3),
+                    "startup_seconds": round(outcome["startup_seconds"], 3) if outcome["startup_seconds"] else None,
+                    "fit_seconds": round(fit["seconds"], 3) if fit.get("seconds") is not None else None,
+                    "predict_seconds": round(predict["seconds"], 3) if predict.get("seconds") is not None else None,
+                    "peak_rss_mb": round(max(peaks), 1) if peaks else None,
+                    "accuracy": round(scores[0], 4) if scores[0] is not None else None,
+                    "f1_weighted": round(scores[3], 4) if scores[3] is not None else None,
+                }
+                if outcome.get("error"):
+                    row["error"] = outcome["error"]
+                results.append(row)
+                if progress is not None:
+                    progress(row)
+        finally:
+            release(train_blocks + test_blocks)
+    return stages, results
+
+
+def format_table(results):
+    columns = ["rows", "model", "status", "wall_seconds", "fit_seconds", "predict_seconds", "peak_rss_mb", "f1_weighted"]
+    frame = pd.DataFrame(results, columns=columns)
+    return frame.to_string(index=False, na_rep="-")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark pipeline Modeling SENTILAB (TF-IDF -> oversampling -> latih -> evaluasi) per ukuran data dan classifier"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--models", nargs="+", help="Hanya jalankan classifier tertentu (default: semua yang ada di aplikasi)")
+    parser.add_argument("--data", help="CSV berlabel (kolom Komentar dan Label) untuk disampel; default: data sintetis")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-seconds", type=float, default=DEFAULT_MAX_SECONDS,
+                        help="Batas waktu per konfigurasi (0 = tanpa batas)")
+    parser.add_argument("--max-memory-mb", type=float, default=DEFAULT_MAX_MEMORY_MB,
+                        help="Batas RSS per konfigurasi dalam MB (0 = tanpa batas)")
+    parser.add_argument("--output", help="Simpan hasil JSON ke file")
+    args = parser.parse_args(argv)
+
+    available = app_models()
+    model_names = args.models or available
+    unknown = [name for name in model_names if name not in available]
+    if unknown:
+        parser.error(f"classifier tidak dikenal: {', '.join(unknown)} (pilihan: {', '.join(available)})")
+
+    def report(row):
+        status = row["status"] if row["status"] == "ok" else f"{row['status'].upper()} ({row.get('error')})"
+        print(f"[{row['rows']:,} baris] {row['model']}: {row['wall_seconds']:.1f} dtk, {status}", file=sys.stderr, flush=True)
+
+    stages, results = run(args.sizes, model_names, args.seed, args.data, args.max_seconds, args.max_memory_mb, report)
+    meta = metadata(
+        suite="modeling", sizes=args.sizes, seed=args.seed, data=args.data or "synthetic",
+        max_seconds=args.max_seconds, max_memory_mb=args.max_memory_mb, parent_rss_mb=rss_mb(),
+    )
+    write_report({"meta": meta, "stages": stages, "results": results}, args.output)
+
+    print("\n" + format_table(results), file=sys.stderr)
+    failed = [row for row in results if row["status"] != "ok"]
+    if failed:
+        print(f"\nGAGAL: {len(failed)} konfigurasi melewati anggaran atau error:", file=sys.stderr)
+        for row in failed:
+            print(f"  - {row['rows']:,} baris / {row['model']}: {row['status']} - {row.get('error')}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import argparse
+
+import preprocesing
+import resources
+from benchmarks.harness import measure, metadata, write_report
+from benchmarks.synthetic import generate_comments
+from lexicon import LexiconIndex
+from stem_cache import StemCache
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def _fresh_state():
+    # Semua cache dikosongkan agar setiap tahap diukur dalam kondisi dingin
+    preprocesing.row_cache.clear()
+    preprocesing._cached_cleaner.cache_clear()
+    preprocesing.stem_cache = StemCache(preprocesing.stemmer.delegatedStemmer.stem, path=None)
+
+
+def _stem_cold(texts):
+    cache = StemCache(preprocesing.stemmer.delegatedStemmer.stem, path=None)
+    tokens = [text.split() for text in texts]
+    stems = cache.stem_many(w for words in tokens for w in words)
+    return [" ".join(stems[w] for w in words) for words in tokens]
+
+
+def stages(raw, lexicon):
+    # Input tiap tahap adalah output tahap sebelumnya agar setiap tahap bisa diukur terpisah
+    cleaner = preprocesing.TextCleaner()
+    stop_words = resources.load_stopwords()
+    normalized = cleaner.normalize_series(raw)
+    abbreviated = [preprocesing.replace_abbreviations(t) for t in normalized]
+    filtered = [" ".join(w for w in t.split() if w not in stop_words) for t in abbreviated]
+    config = ([], False, {}, True, True)
+
+    def end_to_end():
+        _fresh_state()
+        return preprocesing.run_preprocessing(raw, config, lexicon)
+
+    def end_to_end_cached():
+        return preprocesing.run_preprocessing(raw, config, lexicon)
+
+    def clean_text_per_row():
+        preprocesing._cached_cleaner.cache_clear()
+        return [preprocesing.clean_text(t, [], False, {}, False, False) for t in raw]
+
+    return [
+        ("clean_text_per_row", clean_text_per_row),
+        ("normalize", lambda: cleaner.normalize_series(raw)),
+        ("replace_abbreviations", lambda: [preprocesing.replace_abbreviations(t) for t in normalized]),
+        ("stopwords", lambda: [" ".join(w for w in t.split() if w not in stop_words) for t in abbreviated]),
+        ("stemming", lambda: _stem_cold(filtered)),
+        ("labeling", lambda: lexicon.label_series(filtered)),
+        ("end_to_end", end_to_end),
+        ("end_to_end_cached", end_to_end_cached),
+    ]
+
+
+def run(sizes, seed=42, trace_memory=True, only=None):
+    lexicon = LexiconIndex(
+        resources.load_words(resources.POSITIVE_PATH), resources.load_words(resources.NEGATIVE_PATH)
+    )
+    results = []
+    for size in sizes:
+        raw = generate_comments(size, seed=seed)
+        tokens = int(raw.str.split().str.len().sum())
+        for name, func in stages(raw, lexicon):
+            if only and name not in only:
+                continue
+            seconds, peak_mb, _ = measure(func, trace_memory)
+            results.append({
+                "rows": size,
+                "tokens": tokens,
+                "stage": name,
+                "seconds": round(seconds, 4),
+                "rows_per_sec": round(size / seconds, 1) if seconds else None,
+                "ms_per_1k_rows": round(seconds * 1000 / size * 1000, 3),
+                "peak_memory_mb": round(peak_mb, 2) if peak_mb is not None else None,
+            })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark throughput tahap-tahap preprocessing SENTILAB")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--stages", nargs="+", help="Hanya jalankan tahap tertentu")
+    parser.add_argument("--no-memory", action="store_true", help="Lewati pengukuran memori puncak (tracemalloc)")
+    parser.add_argument("--output", help="Simpan hasil JSON ke file")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.seed, not args.no_memory, args.stages)
+    write_report({"meta": metadata(suite="preprocessing", sizes=args.sizes, seed=args.seed), "results": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
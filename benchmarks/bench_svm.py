@@ -0,0 +1,84 @@
+import argparse
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.model_selection import train_test_split
+from sklearn.svm import SVC
+
+import resources
+from benchmarks.harness import measure, metadata, write_report
+from benchmarks.synthetic import generate_comments
+from features import classification_scores, oversample_sparse
+from lexicon import LexiconIndex
+from linear_svm import build_linear_svm, CalibratedLinearSVC
+
+DEFAULT_SIZES = [5_000, 20_000, 100_000]
+# SVC kernel tumbuh kira-kira kuadratik terhadap jumlah baris; di atas batas ini dilewati
+DEFAULT_MAX_KERNEL_ROWS = 20_000
+
+MODELS = {
+    "svc_rbf": (SVC, True),
+    "svc_rbf_proba": (lambda: SVC(probability=True), True),
+    "linear_svc": (build_linear_svm, False),
+    "linear_svc_calibrated": (CalibratedLinearSVC, False),
+}
+
+
+def dataset(size, seed, lexicon):
+    # Data dan pembagian latih/uji sama persis untuk semua model pada ukuran yang sama
+    raw = generate_comments(size, seed=seed).str.lower()
+    labels = lexicon.label_series(raw)["Label"]
+    X = TfidfVectorizer().fit_transform(raw)
+    X_train, X_test, y_train, y_test = train_test_split(X, labels, test_size=0.2, random_state=42)
+    X_train, y_train = oversample_sparse(X_train, y_train, random_state=42)
+    return X_train, X_test, y_train, y_test
+
+
+def run(sizes, seed=42, trace_memory=True, only=None, max_kernel_rows=DEFAULT_MAX_KERNEL_ROWS):
+    lexicon = LexiconIndex(
+        resources.load_words(resources.POSITIVE_PATH), resources.load_words(resources.NEGATIVE_PATH)
+    )
+    results = []
+    for size in sizes:
+        X_train, X_test, y_train, y_test = dataset(size, seed, lexicon)
+        for name, (factory, kernel) in MODELS.items():
+            if only and name not in only:
+                continue
+            if kernel and size > max_kernel_rows:
+                results.append({"rows": size, "model": name, "skipped": f"rows > {max_kernel_rows}"})
+                continue
+            fit_seconds, peak_mb, model = measure(lambda: factory().fit(X_train, y_train), trace_memory)
+            predict_seconds, _, y_pred = measure(lambda: model.predict(X_test), False)
+            accuracy, precision, recall, f1 = classification_scores(y_test, y_pred)
+            results.append({
+                "rows": size,
+                "train_rows": X_train.shape[0],
+                "features": X_train.shape[1],
+                "model": name,
+                "fit_seconds": round(fit_seconds, 4),
+                "predict_seconds": round(predict_seconds, 4),
+                "predict_rows_per_sec": round(X_test.shape[0] / predict_seconds, 1) if predict_seconds else None,
+                "accuracy": round(accuracy, 4),
+                "f1_weighted": round(f1, 4),
+                "peak_memory_mb": round(peak_mb, 2) if peak_mb is not None else None,
+            })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark SVM kernel (SVC) vs SVM linear (LinearSVC) pada TF-IDF")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--models", nargs="+", choices=list(MODELS), help="Hanya jalankan model tertentu")
+    parser.add_argument("--max-kernel-rows", type=int, default=DEFAULT_MAX_KERNEL_ROWS,
+                        help="Lewati SVC kernel untuk dataset lebih besar dari ini")
+    parser.add_argument("--no-memory", action="store_true", help="Lewati pengukuran memori puncak (tracemalloc)")
+    parser.add_argument("--output", help="Simpan hasil JSON ke file")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.seed, not args.no_memory, args.models, args.max_kernel_rows)
+    meta = metadata(suite="svm", sizes=args.sizes, seed=args.seed, max_kernel_rows=args.max_kernel_rows)
+    write_report({"meta": meta, "results": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
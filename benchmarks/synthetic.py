@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+import resources
+
+EMOJIS = ["😀", "😂", "😍", "😡", "😭", "👍", "🔥", "🙏", "❤️", "🤣"]
+URLS = ["https://youtu.be/abc123", "http://bit.ly/xyz", "www.contoh.com/berita", "https://t.co/AbC9"]
+PUNCTUATION = ["!", "!!", "?", "...", ",", ".", "#", "@admin"]
+# Kata berimbuhan nyata; kombinasi imbuhan acak membuat Sastrawi jauh lebih lambat dari data asli
+DERIVED = """
+membeli pembelian dibelikan penjual menjual dijual bermain permainan dimainkan belajar pelajaran
+mempelajari membaca bacaan dibaca menulis tulisan penulis bekerja pekerjaan dikerjakan berpikir
+pemikiran menonton tontonan mendengar pendengaran kebijakan bijaksana memimpin pemimpin
+kepemimpinan membantu bantuan bantuannya harganya berharga menjanjikan perjanjian janjinya memilih
+pemilihan pilihan kerakyatan membangun pembangunan bangunan kelakuan berlaku menggunakan kegunaan
+perjalanan berjalan makanan dimakan minuman tertidur melihat penglihatan mendukung dukungan
+pendukung menolak penolakan mengkritik kritikan memuji pujian menghina hinaan pemerintah
+pemerintahan diberitakan pemberitaan kenaikan menaikkan menurunkan penurunan keadilan ketidakadilan
+""".split()
+LEXICON_SAMPLE = 200
+
+
+def _vocabulary():
+    # Subset kamus diambil dengan seed tetap supaya kosakata sama untuk semua ukuran data
+    rng = np.random.default_rng(0)
+    positive = sorted(w for w in resources.load_words(resources.POSITIVE_PATH) if " " not in w)
+    negative = sorted(w for w in resources.load_words(resources.NEGATIVE_PATH) if " " not in w)
+    positive = list(rng.choice(positive, size=min(LEXICON_SAMPLE, len(positive)), replace=False))
+    negative = list(rng.choice(negative, size=min(LEXICON_SAMPLE, len(negative)), replace=False))
+    slang = sorted(resources.load_abbreviations())
+    stopwords = sorted(resources.load_stopwords())
+
+    # Frekuensi kata dibuat mirip distribusi Zipf agar rasio token unik realistis
+    groups = [
+        (DERIVED, 0.30), (stopwords, 0.25), (slang, 0.20), (positive, 0.10),
+        (negative, 0.10), (EMOJIS + URLS + PUNCTUATION, 0.05),
+    ]
+    words, weights = [], []
+    for group, share in groups:
+        ranks = 1.0 / np.arange(1, len(group) + 1)
+        words.extend(group)
+        weights.extend(share * ranks / ranks.sum())
+    weights = np.asarray(weights)
+    return np.asarray(words, dtype=object), weights / weights.sum()
+
+
+def generate_comments(n, seed=42, min_tokens=3, max_tokens=30):
+    # Komentar media sosial sintetis: slang, emoji, URL, kata kamus, dan kata berimbuhan
+    rng = np.random.default_rng(seed)
+    words, weights = _vocabulary()
+    lengths = rng.integers(min_tokens, max_tokens + 1, size=n)
+    tokens = rng.choice(words, size=int(lengths.sum()), p=weights)
+    upper = rng.random(len(tokens)) < 0.05
+    tokens[upper] = [t.upper() for t in tokens[upper]]
+
+    comments = []
+    start = 0
+    for length in lengths:
+        comments.append(" ".join(tokens[start:start + length]))
+        start += length
+    return pd.Series(comments, name="Komentar")
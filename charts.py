@@ -0,0 +1,98 @@
+import io
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from matplotlib.figure import Figure
+from scipy import sparse
+from wordcloud import WordCloud
+
+from artifacts import ArtifactCache
+
+MAX_WORDS = 200
+# Cache terpisah untuk PNG agar gambar tidak menggeser fitur/model dari artifact_cache
+chart_cache = ArtifactCache(max_entries=64, max_bytes=128 * 1024 ** 2)
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="charts")
+
+
+def term_frequencies(counts, labels, vocabulary, max_words=MAX_WORDS):
+    # Hitungan kata keseluruhan dan per label dari matriks hitungan yang sudah dibuat saat
+    # TF-IDF (tanpa tokenisasi ulang); label dikelompokkan lewat perkalian matriks indikator
+    words = np.empty(len(vocabulary), dtype=object)
+    for word, index in vocabulary.items():
+        words[index] = word
+
+    codes, names = pd.factorize(pd.Series(labels).astype(str).str.lower())
+    indicator = sparse.csr_matrix(
+        (np.ones(len(codes)), (codes, np.arange(len(codes)))), shape=(len(names), len(codes))
+    )
+    per_label = np.asarray((indicator @ counts).todense())
+
+    def top(row):
+        order = np.argsort(row)[::-1][:max_words]
+        return {words[i]: float(row[i]) for i in order if row[i] > 0}
+
+    return {"all": top(per_label.sum(axis=0)), "labels": {name: top(row) for name, row in zip(names, per_label)}}
+
+
+def wordcloud_png(frequencies, width=400, height=300, colormap=None):
+    wc = WordCloud(width=width, height=height, background_color='white', colormap=colormap, max_words=MAX_WORDS)
+    buf = io.BytesIO()
+    wc.generate_from_frequencies(frequencies).to_image().save(buf, format="png")
+    return buf.getvalue()
+
+
+def wordcloud_from(frequencies, label, width, height, colormap=None):
+    # frequencies: Future hasil term_frequencies; label None berarti seluruh komentar
+    result = frequencies.result()
+    return wordcloud_png(result["all"] if label is None else result["labels"].get(label, {}), width, height, colormap)
+
+
+def _figure_png(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight")
+    return buf.getvalue()
+
+
+def accuracy_chart_png(metrics_df):
+    # Figure dibuat tanpa pyplot agar aman dirender di thread pekerja
+    plot_df = metrics_df.assign(Akurasi=metrics_df['Akurasi'] * 100)
+    fig = Figure(figsize=(10, 5))
+    ax = fig.subplots()
+    sns.barplot(x='Model', y='Akurasi', data=plot_df, ax=ax, palette='coolwarm', hue='Model', legend=False)
+    ax.set_ylim(0, 100)
+    ax.set_ylabel("Akurasi (%)")
+    for p in ax.patches:
+        ax.annotate(
+            f"{p.get_height():.1f}%",
+            (p.get_x() + p.get_width() / 2., p.get_height()),
+            ha='center', va='bottom', fontsize=9, color='black'
+        )
+    return _figure_png(fig)
+
+
+def distribution_chart_png(counts):
+    fig = Figure(figsize=(6, 3))
+    ax = fig.subplots()
+    ax.pie(counts, labels=counts.index, autopct='%1.1f%%', startangle=140, wedgeprops={'edgecolor': 'black'})
+    ax.axis('equal')
+    return _figure_png(fig)
+
+
+def render(key, func, *args):
+    # Mengembalikan Future berisi PNG; hasil yang sudah pernah dirender diambil dari chart_cache,
+    # sisanya dirender paralel di thread pool sehingga grafik tidak saling menunggu
+    cached = chart_cache.get(key)
+    if cached is not None:
+        future = Future()
+        future.set_result(cached)
+        return future
+    future = _executor.submit(func, *args)
+
+    def store(done):
+        if done.exception() is None:
+            chart_cache.put(key, done.result())
+
+    future.add_done_callback(store)
+    return future
@@ -0,0 +1,86 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from imblearn.over_sampling import RandomOverSampler
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+
+
+def oversample_indices(y, random_state=42):
+    # RandomOverSampler hanya butuh label untuk memilih baris; dengan X berupa
+    # satu kolom dummy, yang disampling adalah indeks baris, bukan isi matriks
+    ros = RandomOverSampler(random_state=random_state)
+    ros.fit_resample(np.zeros((len(y), 1), dtype=np.int8), y)
+    return ros.sample_indices_
+
+
+def oversample_sparse(X, y, random_state=42):
+    # Baris minoritas digandakan lewat indexing CSR, hasilnya identik dengan
+    # RandomOverSampler pada matriks dense tetapi tanpa densifikasi
+    indices = oversample_indices(y, random_state)
+    X = sparse.csr_matrix(X)
+    y = y.iloc[indices] if isinstance(y, pd.Series) else np.asarray(y)[indices]
+    return X[indices], y
+
+
+def classification_scores(y_true, y_pred):
+    # Metrik yang ditampilkan dashboard: akurasi, precision, recall, F1 (weighted)
+    accuracy = accuracy_score(y_true, y_pred)
+    precision = precision_score(y_true, y_pred, average='weighted', zero_division=1)
+    recall = recall_score(y_true, y_pred, average='weighted', zero_division=1)
+    f1 = f1_score(y_true, y_pred, average='weighted', zero_division=1)
+    return accuracy, precision, recall, f1
+
+
+def matrix_bytes(X):
+    if sparse.issparse(X):
+        X = X.tocsr()
+        return X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+    return np.asarray(X).nbytes
+
+
+def matrix_stats(X, name):
+    rows, cols = X.shape
+    nnz = X.nnz if sparse.issparse(X) else int(np.count_nonzero(X))
+    return {
+        "Matriks": name,
+        "Baris": rows,
+        "Fitur": cols,
+        "Nilai Non-Nol": nnz,
+        "Kepadatan": nnz / (rows * cols) if rows and cols else 0.0,
+        "Memori (MB)": matrix_bytes(X) / 1024 ** 2,
+        "Memori jika Dense (MB)": rows * cols * X.dtype.itemsize / 1024 ** 2,
+    }
+
+
+def share_csr(X):
+    # Array data/indices/indptr disalin sekali ke shared memory sehingga semua
+    # worker membaca matriks yang sama tanpa pickling per tugas
+    X = sparse.csr_matrix(X)
+    blocks, spec = [], {"shape": X.shape}
+    for part in ("data", "indices", "indptr"):
+        array = getattr(X, part)
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+        blocks.append(block)
+        spec[part] = (block.name, array.shape, array.dtype.str)
+    return blocks, spec
+
+
+def attach_csr(spec):
+    # Blok harus tetap direferensikan selama matriks dipakai
+    blocks, arrays = [], {}
+    for part in ("data", "indices", "indptr"):
+        name, shape, dtype = spec[part]
+        block = shared_memory.SharedMemory(name=name)
+        arrays[part] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        blocks.append(block)
+    X = sparse.csr_matrix((arrays["data"], arrays["indices"], arrays["indptr"]), shape=spec["shape"], copy=False)
+    return blocks, X
+
+
+def release(blocks):
+    for block in blocks:
+        block.close()
+        block.unlink()
@@ -0,0 +1,137 @@
+import hashlib
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.naive_bayes import MultinomialNB
+
+from batch_inference import iter_chunks
+from features import classification_scores
+
+HASH_FEATURES = 2 ** 20
+DEFAULT_CHUNK_SIZE = 50_000
+DEFAULT_MAX_HOLDOUT = 100_000
+INCREMENTAL_MODELS = ['Naive Bayes', 'SGD (SVM Linear)', 'SGD (Regresi Logistik)']
+TEXT_COLUMN = 'Komentar'
+LABEL_COLUMN = 'Label'
+
+
+def build_vectorizer(n_features=HASH_FEATURES):
+    # Stateless: tidak perlu vocabulary, jadi bisa dipakai per chunk tanpa fit.
+    # alternate_sign=False agar fitur non-negatif untuk MultinomialNB.
+    return HashingVectorizer(n_features=n_features, alternate_sign=False, norm='l2')
+
+
+def build_incremental_model(model_name, random_state=42):
+    models = {
+        'Naive Bayes': lambda: MultinomialNB(alpha=0.01),
+        'SGD (SVM Linear)': lambda: SGDClassifier(loss='hinge', alpha=1e-5, random_state=random_state),
+        'SGD (Regresi Logistik)': lambda: SGDClassifier(loss='log_loss', alpha=1e-5, random_state=random_state),
+    }
+    factory = models.get(model_name)
+    return factory() if factory is not None else None
+
+
+def _rewind(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+
+def scan_labels(source, fmt, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Lintasan awal yang murah (hanya kolom Label) untuk mengetahui kelas dan distribusinya
+    counts = pd.Series(dtype="int64")
+    for chunk in iter_chunks(_rewind(source), fmt, chunk_size, columns=[LABEL_COLUMN]):
+        counts = counts.add(chunk[LABEL_COLUMN].dropna().value_counts(), fill_value=0)
+    return counts.astype("int64").sort_index()
+
+
+def balanced_weights(counts):
+    # Bobot n / (k * n_kelas): pengganti RandomOverSampler yang butuh seluruh data di memori
+    total, k = counts.sum(), len(counts)
+    return {label: total / (k * count) for label, count in counts.items()}
+
+
+def _holdout_mask(n, chunk_no, test_size, random_state):
+    # Deterministik per chunk, sehingga setiap epoch memakai pembagian yang sama
+    rng = np.random.default_rng([random_state, chunk_no])
+    return rng.random(n) < test_size
+
+
+def train_incremental(source, fmt, model_names=INCREMENTAL_MODELS, chunk_size=DEFAULT_CHUNK_SIZE,
+                      test_size=0.2, max_holdout=DEFAULT_MAX_HOLDOUT, epochs=1, n_features=HASH_FEATURES,
+                      random_state=42, progress=None):
+    # Melatih model partial_fit per chunk. Sebagian baris tiap chunk (test_size, maks.
+    # max_holdout baris) disisihkan sebagai data uji dan tidak pernah dipakai melatih.
+    counts = scan_labels(source, fmt, chunk_size)
+    if len(counts) < 2:
+        raise ValueError("Data pelatihan hanya memiliki satu kelas.")
+    classes = counts.index.to_numpy()
+    weights = balanced_weights(counts)
+
+    vectorizer = build_vectorizer(n_features)
+    models = {name: build_incremental_model(name, random_state) for name in model_names}
+    models = {name: model for name, model in models.items() if model is not None}
+    seconds = {name: 0.0 for name in models}
+
+    holdout_X, holdout_y = [], []
+    holdout_rows = rows_train = 0
+    data_hash = hashlib.sha1()
+    start = time.perf_counter()
+
+    for epoch in range(max(1, int(epochs))):
+        reserved = 0
+        for chunk_no, chunk in enumerate(iter_chunks(_rewind(source), fmt, chunk_size, columns=[TEXT_COLUMN, LABEL_COLUMN])):
+            chunk = chunk[chunk[LABEL_COLUMN].notna()]
+            texts = chunk[TEXT_COLUMN].fillna("").astype(str)
+            labels = chunk[LABEL_COLUMN]
+            if epoch == 0:
+                data_hash.update(pd.util.hash_pandas_object(chunk, index=False).to_numpy().tobytes())
+
+            mask = _holdout_mask(len(chunk), chunk_no, test_size, random_state)
+            room = max(0, max_holdout - reserved)
+            if mask.sum() > room:
+                mask[np.flatnonzero(mask)[room:]] = False
+            reserved += int(mask.sum())
+
+            if epoch == 0 and mask.any():
+                holdout_X.append(vectorizer.transform(texts[mask]))
+                holdout_y.append(labels[mask].to_numpy())
+                holdout_rows += int(mask.sum())
+
+            train = ~mask
+            if not train.any():
+                continue
+            X = vectorizer.transform(texts[train])
+            y = labels[train].to_numpy()
+            sample_weight = labels[train].map(weights).to_numpy(dtype=float)
+            for name, model in models.items():
+                t = time.perf_counter()
+                model.partial_fit(X, y, classes=classes, sample_weight=sample_weight)
+                seconds[name] += time.perf_counter() - t
+            if epoch == 0:
+                rows_train += int(train.sum())
+            if progress is not None:
+                progress(epoch + 1, chunk_no + 1, rows_train, holdout_rows)
+
+    if not holdout_rows:
+        raise ValueError("Tidak ada baris untuk data uji; perbesar ukuran data uji.")
+    X_test = sparse.vstack(holdout_X, format="csr")
+    y_test = np.concatenate(holdout_y)
+    metrics = {name: classification_scores(y_test, model.predict(X_test)) for name, model in models.items()}
+
+    return {
+        "vectorizer": vectorizer,
+        "models": models,
+        "metrics": metrics,
+        "seconds": seconds,
+        "classes": list(classes),
+        "class_counts": counts.to_dict(),
+        "rows_train": rows_train,
+        "rows_holdout": holdout_rows,
+        "data_key": data_hash.hexdigest(),
+        "total_seconds": time.perf_counter() - start,
+    }
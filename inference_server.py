@@ -0,0 +1,284 @@
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+import model_registry
+from preprocesing import TextCleaner
+from batch_inference import predict_texts
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 5.0
+LATENCY_WINDOW = 10_000
+CLEANER_MAX_TOKENS = 100_000
+
+
+class ServerMetrics:
+    # Latensi per request disimpan dalam jendela bergulir; persentil dihitung saat /metrics dipanggil
+    def __init__(self, window=LATENCY_WINDOW):
+        self.started = time.time()
+        self.requests = 0
+        self.comments = 0
+        self.batches = 0
+        self.errors = 0
+        self.batch_seconds = 0.0
+        self._latencies = deque(maxlen=window)
+        self._finished = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record_request(self, seconds, comments):
+        with self._lock:
+            self.requests += 1
+            self.comments += comments
+            self._latencies.append(seconds)
+            self._finished.append((time.time(), comments))
+
+    def record_batch(self, seconds):
+        with self._lock:
+            self.batches += 1
+            self.batch_seconds += seconds
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def snapshot(self):
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000
+            finished = list(self._finished)
+            uptime = time.time() - self.started
+            data = {
+                "uptime_seconds": uptime,
+                "requests": self.requests,
+                "comments": self.comments,
+                "errors": self.errors,
+                "batches": self.batches,
+                "mean_batch_size": self.comments / self.batches if self.batches else 0.0,
+                "mean_batch_ms": self.batch_seconds / self.batches * 1000 if self.batches else 0.0,
+                "throughput_per_sec": self.comments / uptime if uptime else 0.0,
+            }
+        if len(finished) > 1:
+            span = finished[-1][0] - finished[0][0]
+            data["recent_throughput_per_sec"] = sum(c for _, c in finished[1:]) / span if span else 0.0
+        if len(latencies):
+            p50, p90, p95, p99 = np.percentile(latencies, [50, 90, 95, 99])
+            data["latency_ms"] = {"p50": p50, "p90": p90, "p95": p95, "p99": p99, "max": float(latencies.max())}
+        return data
+
+
+class MicroBatcher:
+    # Request yang datang bersamaan digabung menjadi satu batch: batch dikirim jika
+    # jumlah komentar mencapai max_batch_size atau max_wait_ms sejak request pertama
+    def __init__(self, predict_batch, max_batch_size=DEFAULT_MAX_BATCH_SIZE,
+                 max_wait_ms=DEFAULT_MAX_WAIT_MS, metrics=None):
+        self.predict_batch = predict_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000
+        self.metrics = metrics
+        self._queue = queue.Queue()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts):
+        future = Future()
+        self._queue.put((list(texts), future))
+        return future
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def stop(self):
+        self._stopped.set()
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first):
+        items, size = [first], len(first[0])
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            items.append(item)
+            size += len(item[0])
+        return items
+
+    def _run(self):
+        while not self._stopped.is_set():
+            first = self._queue.get()
+            if first is None:
+                break
+            items = self._collect(first)
+            texts = [text for item_texts, _ in items for text in item_texts]
+            start = time.perf_counter()
+            try:
+                results = self.predict_batch(texts)
+            except Exception as e:
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+            if self.metrics is not None:
+                self.metrics.record_batch(time.perf_counter() - start)
+            offset = 0
+            for item_texts, future in items:
+                future.set_result(results[offset:offset + len(item_texts)])
+                offset += len(item_texts)
+
+
+def make_predictor(pipeline, cleaner_args, max_tokens=CLEANER_MAX_TOKENS):
+    # Pembersihan sama dengan preprocesing.clean_text, tetapi untuk satu batch sekaligus.
+    # Cleaner milik server sendiri dengan tabel token terbatas, karena server menerima
+    # token baru terus-menerus dan tidak pernah berhenti
+    cleaner = TextCleaner(*cleaner_args, max_tokens=max_tokens)
+    classes = [str(c) for c in getattr(pipeline, "classes_", [])]
+
+    def predict_batch(texts):
+        cleaned = cleaner.clean_series(pd.Series(texts, dtype=object))
+        labels, proba = predict_texts(pipeline, cleaned.tolist())
+        results = []
+        for i, label in enumerate(labels):
+            result = {"label": label.item() if hasattr(label, "item") else label}
+            if proba is not None:
+                result["probabilities"] = dict(zip(classes, proba[i].tolist()))
+            results.append(result)
+        return results
+
+    return predict_batch
+
+
+class InferenceHandler(BaseHTTPRequestHandler):
+    server_version = "SentilabInference/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "model": self.server.model_info})
+        elif self.path == "/metrics":
+            data = self.server.metrics.snapshot()
+            data["queue_depth"] = self.server.batcher.queue_depth()
+            data["max_batch_size"] = self.server.batcher.max_batch_size
+            data["max_wait_ms"] = self.server.batcher.max_wait * 1000
+            data["model"] = self.server.model_info
+            self._send_json(200, data)
+        else:
+            self._send_json(404, {"error": "endpoint tidak ditemukan"})
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send_json(404, {"error": "endpoint tidak ditemukan"})
+            return
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("body harus berupa objek JSON")
+            if "texts" in payload:
+                texts = payload["texts"]
+            elif "text" in payload:
+                texts = [payload["text"]]
+            else:
+                raise ValueError("body harus berisi 'text' atau 'texts'")
+            if not isinstance(texts, list):
+                raise ValueError("'texts' harus berupa list")
+        except ValueError as e:
+            self.server.metrics.record_error()
+            self._send_json(400, {"error": str(e)})
+            return
+
+        try:
+            predictions = self.server.batcher.submit(texts).result(timeout=self.server.request_timeout)
+        except Exception as e:
+            self.server.metrics.record_error()
+            self._send_json(500, {"error": str(e)})
+            return
+        self.server.metrics.record_request(time.perf_counter() - start, len(texts))
+        self._send_json(200, {"predictions": predictions})
+
+
+class InferenceHTTPServer(ThreadingHTTPServer):
+    # Backlog bawaan socketserver hanya 5 koneksi; terlalu kecil untuk klien yang bersamaan
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def create_server(pipeline, cleaner_args, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                  max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS,
+                  model_info=None, request_timeout=60.0, verbose=False):
+    # port=0 memilih port bebas; alamat sebenarnya ada di server.server_address
+    server = InferenceHTTPServer((host, port), InferenceHandler)
+    server.metrics = ServerMetrics()
+    server.batcher = MicroBatcher(make_predictor(pipeline, cleaner_args), max_batch_size, max_wait_ms, server.metrics)
+    server.model_info = model_info or {}
+    server.request_timeout = request_timeout
+    server.verbose = verbose
+    return server
+
+
+def shutdown(server):
+    server.shutdown()
+    server.server_close()
+    server.batcher.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Server HTTP lokal untuk prediksi sentimen dengan model dari registry SENTILAB")
+    parser.add_argument("--model", required=True, help="Nama model di registry, mis. 'Naive Bayes'")
+    parser.add_argument("--version", type=int, help="Versi model (default: terbaru)")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS)
+    parser.add_argument("--auto-stopwords", action="store_true")
+    parser.add_argument("--auto-stemming", action="store_true")
+    parser.add_argument("--registry", default=model_registry.REGISTRY_DIR)
+    parser.add_argument("--verbose", action="store_true", help="Tampilkan log setiap request")
+    args = parser.parse_args(argv)
+
+    pipeline, metadata = model_registry.load_model(args.model, args.version, registry_dir=args.registry)
+    model_info = {key: metadata.get(key) for key in ("name", "version", "dataset_hash", "created_at")}
+    server = create_server(
+        pipeline, ([], False, {}, args.auto_stopwords, args.auto_stemming), args.host, args.port,
+        args.max_batch_size, args.max_wait_ms, model_info, verbose=args.verbose
+    )
+    host, port = server.server_address[:2]
+    print(f"{metadata['name']} v{metadata['version']} siap di http://{host}:{port} (POST /predict, GET /metrics)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.batcher.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.decomposition import TruncatedSVD
+from sklearn.neighbors import KDTree
+from sklearn.preprocessing import normalize
+
+DEFAULT_MAX_MEMORY_MB = 256
+DEFAULT_COMPONENTS = 16
+# Indeks pohon hanya efektif untuk dimensi rendah; di atas ini pencarian blok (BLAS) lebih cepat
+TREE_MAX_COMPONENTS = 20
+# Byte per sel (baris uji x data latih) yang hidup bersamaan dalam satu blok:
+# hasil perkalian sparse (nilai float32 + indeks int32) saat dikonversi ke skor dense float32,
+# lalu skor dense + indeks argpartition int64; ditambah cadangan untuk indptr dan temporari
+SPARSE_BYTES_PER_CELL = 24
+DENSE_BYTES_PER_CELL = 16
+
+
+class CosineKNN(ClassifierMixin, BaseEstimator):
+    # KNN dengan jarak cosine untuk TF-IDF.
+    # mode='exact': kemiripan dihitung langsung pada matriks sparse yang dinormalisasi,
+    #   per blok baris uji; ukuran blok dibatasi max_memory_mb (matriks skor blok x data latih).
+    # mode='svd': TF-IDF direduksi dengan TruncatedSVD ke n_components dimensi lalu dicari
+    #   dengan KDTree (atau blok dense jika n_components > TREE_MAX_COMPONENTS); hasilnya
+    #   aproksimasi: n_components kecil lebih cepat, n_components besar lebih akurat.
+    def __init__(self, n_neighbors=5, weights="uniform", mode="exact", n_components=DEFAULT_COMPONENTS,
+                 max_memory_mb=DEFAULT_MAX_MEMORY_MB, random_state=42):
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+        self.mode = mode
+        self.n_components = n_components
+        self.max_memory_mb = max_memory_mb
+        self.random_state = random_state
+
+    def fit(self, X, y):
+        if self.mode not in ("exact", "svd"):
+            raise ValueError(f"mode KNN tidak dikenal: {self.mode!r}")
+        self.classes_, self._labels = np.unique(np.asarray(y), return_inverse=True)
+        X = normalize(X.astype(np.float32), norm="l2")
+        if self.mode == "svd":
+            n_components = max(1, min(self.n_components, X.shape[1] - 1))
+            self._svd = TruncatedSVD(n_components=n_components, random_state=self.random_state)
+            reduced = normalize(self._svd.fit_transform(X)).astype(np.float32)
+            self._tree = KDTree(reduced) if n_components <= TREE_MAX_COMPONENTS else None
+            self._train_t = reduced.T
+        else:
+            self._tree = None
+            # Disimpan sebagai transpos CSR agar perkalian per blok tidak mengonversi ulang
+            self._train_t = X.T.tocsr()
+        self.n_features_in_ = X.shape[1]
+        self.n_samples_fit_ = X.shape[0]
+        return self
+
+    def _block_rows(self):
+        # Jumlah baris uji per blok agar memori kerja blok tidak melewati max_memory_mb
+        sparse_scores = self.mode == "exact"
+        per_row = self.n_samples_fit_ * (SPARSE_BYTES_PER_CELL if sparse_scores else DENSE_BYTES_PER_CELL)
+        return max(1, int(self.max_memory_mb * 2 ** 20 // per_row))
+
+    def kneighbors(self, X):
+        # Mengembalikan (jarak cosine, indeks) berukuran n_baris x k, urut dari yang terdekat
+        k = min(self.n_neighbors, self.n_samples_fit_)
+        X = normalize(X.astype(np.float32), norm="l2")
+        distances, indices = [], []
+        step = self._block_rows()
+        for start in range(0, X.shape[0], step):
+            block = X[start:start + step]
+            if self.mode == "svd":
+                block = normalize(self._svd.transform(block)).astype(np.float32)
+            if self._tree is not None:
+                # Untuk vektor satuan: jarak euclidean^2 = 2 * (1 - cosine)
+                dist, idx = self._tree.query(block, k=k)
+                dist = dist ** 2 / 2
+            else:
+                sims = block @ self._train_t
+                if hasattr(sims, "toarray"):
+                    product = sims
+                    sims = product.toarray()
+                    del product
+                # Tanpa -sims agar tidak ada salinan skor kedua
+                n = sims.shape[1]
+                idx = np.argpartition(sims, n - k, axis=1)[:, n - k:]
+                dist = 1 - np.take_along_axis(sims, idx, axis=1)
+                order = np.argsort(dist, axis=1, kind="stable")
+                dist = np.take_along_axis(dist, order, axis=1)
+                idx = np.take_along_axis(idx, order, axis=1)
+            distances.append(dist)
+            indices.append(idx)
+        if not indices:
+            return np.empty((0, k)), np.empty((0, k), dtype=np.intp)
+        return np.vstack(distances), np.vstack(indices)
+
+    def predict_proba(self, X):
+        distances, indices = self.kneighbors(X)
+        if self.weights == "distance":
+            votes = 1 / np.maximum(distances, 1e-10)
+        else:
+            votes = np.ones_like(distances)
+        proba = np.zeros((len(indices), len(self.classes_)))
+        rows = np.repeat(np.arange(len(indices)), indices.shape[1])
+        np.add.at(proba, (rows, self._labels[indices].ravel()), votes.ravel())
+        return proba / np.maximum(proba.sum(axis=1, keepdims=True), 1e-12)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
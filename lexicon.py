@@ -0,0 +1,81 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+LABEL_COLUMNS = ["Label", "Skor Positif", "Skor Negatif"]
+
+
+class LexiconIndex:
+    # Kamus positif/negatif dikompilasi menjadi set (lookup O(1)). Jika frasa
+    # multi-kata diaktifkan, token dipindai kiri ke kanan dengan pencocokan frasa
+    # terpanjang; kata yang sudah tercakup frasa tidak dihitung lagi sebagai kata
+    # tunggal ("tidak bagus" hanya negatif). Label satu kolom ditentukan sekaligus.
+    def __init__(self, positive_words, negative_words, match_phrases=False):
+        self.positive = frozenset(positive_words)
+        self.negative = frozenset(negative_words)
+        self.match_phrases = match_phrases
+        self.fingerprint = hashlib.sha1("\n".join(
+            sorted(self.positive) + ["\0"] + sorted(self.negative) + [str(match_phrases)]
+        ).encode("utf-8")).hexdigest()[:16]
+
+        terms = self.positive | self.negative
+        if not match_phrases:
+            # Tanpa pencocokan frasa, entri multi-kata tidak pernah cocok dengan token tunggal
+            terms = {t for t in terms if len(t.split()) == 1}
+        self.terms = frozenset(terms)
+        self.max_ngram = max((len(t.split()) for t in self.terms), default=1)
+        # Panjang frasa yang mungkin per kata pertama, dicoba dari yang terpanjang
+        lengths = {}
+        for term in self.terms:
+            words = term.split()
+            if len(words) > 1:
+                lengths.setdefault(words[0], set()).add(len(words))
+        self._phrase_lengths = {word: sorted(ns, reverse=True) for word, ns in lengths.items()}
+
+    def _count_tokens(self, tokens):
+        pos = neg = 0
+        i, n = 0, len(tokens)
+        while i < n:
+            term, step = tokens[i], 1
+            for length in self._phrase_lengths.get(term, ()):
+                if length <= n - i:
+                    candidate = " ".join(tokens[i:i + length])
+                    if candidate in self.terms:
+                        term, step = candidate, length
+                        break
+            pos += term in self.positive
+            neg += term in self.negative
+            i += step
+        return pos, neg
+
+    def counts(self, texts):
+        texts = pd.Series(texts).fillna("").astype(str)
+        tokens = [text.split() for text in texts]
+        if not self.match_phrases or self.max_ngram == 1:
+            # Untuk kamus satu kata cukup lookup set per token
+            pos = np.fromiter((sum(1 for w in ws if w in self.positive) for ws in tokens), np.int64, len(tokens))
+            neg = np.fromiter((sum(1 for w in ws if w in self.negative) for ws in tokens), np.int64, len(tokens))
+            return pos, neg
+        counts = np.array([self._count_tokens(ws) for ws in tokens], dtype=np.int64).reshape(-1, 2)
+        return counts[:, 0], counts[:, 1]
+
+    def label_series(self, texts, threshold=0.1, prefer_dominant=True):
+        texts = pd.Series(texts).fillna("").astype(str)
+        pos, neg = self.counts(texts)
+        total = np.maximum(texts.str.split().str.len().to_numpy(dtype=np.int64), 1)
+        pos_score = pos / total
+        neg_score = neg / total
+
+        conditions = [pos_score - neg_score > threshold, neg_score - pos_score > threshold]
+        choices = ["Positif", "Negatif"]
+        if prefer_dominant:
+            conditions += [pos > neg, neg > pos]
+            choices += ["Positif", "Negatif"]
+        labels = np.select(conditions, choices, default="Netral")
+
+        return pd.DataFrame({
+            "Label": labels,
+            "Skor Positif": pos_score,
+            "Skor Negatif": neg_score,
+        }, index=texts.index)
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.model_selection import train_test_split
+from sklearn.svm import LinearSVC
+
+
+def build_linear_svm(C=1.0, random_state=42):
+    # Solver liblinear: waktu latih kira-kira linear terhadap jumlah nilai non-nol,
+    # cocok untuk TF-IDF sparse berdimensi tinggi (SVC kernel RBF tumbuh super-linear)
+    return LinearSVC(C=C, dual="auto", random_state=random_state)
+
+
+def row_groups(X, y):
+    # Id grup per baris: baris dengan fitur dan label identik (mis. salinan hasil
+    # oversampling) mendapat id yang sama
+    y = np.asarray(y)
+    if sparse.issparse(X):
+        X = sparse.csr_matrix(X, copy=True)
+        X.sum_duplicates()
+        X.sort_indices()
+        keys = [
+            (X.indices[start:end].tobytes(), X.data[start:end].tobytes(), label)
+            for start, end, label in zip(X.indptr[:-1], X.indptr[1:], y)
+        ]
+    else:
+        X = np.ascontiguousarray(X)
+        keys = [(row.tobytes(), label) for row, label in zip(X, y)]
+    return pd.factorize(pd.Series(keys, dtype=object))[0]
+
+
+class CalibratedLinearSVC(ClassifierMixin, BaseEstimator):
+    # LinearSVC dengan probabilitas: SVM dilatih sekali pada sebagian besar data latih,
+    # lalu kalibrasi sigmoid/isotonic dipasang sekali pada sisanya. Berbeda dengan
+    # SVC(probability=True) yang menjalankan 5-fold CV internal.
+    # Data latih di halaman Modeling sudah di-oversample, jadi pembagian dilakukan per
+    # baris unik: semua salinan satu baris jatuh di sisi yang sama, dan data kalibrasi
+    # hanya memakai satu salinan sehingga mengikuti distribusi kelas aslinya.
+    def __init__(self, C=1.0, calibration_size=0.1, method="sigmoid", random_state=42):
+        self.C = C
+        self.calibration_size = calibration_size
+        self.method = method
+        self.random_state = random_state
+
+    def fit(self, X, y):
+        y = np.asarray(y)
+        groups = row_groups(X, y)
+        _, first = np.unique(groups, return_index=True)
+        try:
+            _, cal_first = train_test_split(
+                first, test_size=self.calibration_size, random_state=self.random_state, stratify=y[first]
+            )
+        except ValueError:
+            # Pembagian berstrata per baris unik tidak mungkin (mis. kelas dengan satu
+            # baris unik, atau data kalibrasi lebih sedikit dari jumlah kelas)
+            return self._fit_cross_validated(X, y)
+        is_cal = np.zeros(groups.max() + 1, dtype=bool)
+        is_cal[groups[cal_first]] = True
+        fit_rows = np.flatnonzero(~is_cal[groups])
+        svm = build_linear_svm(self.C, self.random_state).fit(X[fit_rows], y[fit_rows])
+        self.calibrated_ = CalibratedClassifierCV(svm, method=self.method, cv="prefit").fit(X[cal_first], y[cal_first])
+        self.classes_ = self.calibrated_.classes_
+        return self
+
+    def _fit_cross_validated(self, X, y):
+        # Cadangan untuk data sangat kecil: kalibrasi CV biasa per baris. Salinan
+        # oversampling bisa jatuh di kedua sisi fold, jadi probabilitasnya lebih optimis.
+        smallest = np.unique(y, return_counts=True)[1].min()
+        if smallest < 2:
+            raise ValueError("Setiap kelas membutuhkan minimal 2 baris untuk kalibrasi SVM Linear.")
+        svm = build_linear_svm(self.C, self.random_state)
+        self.calibrated_ = CalibratedClassifierCV(svm, method=self.method, cv=min(3, smallest)).fit(X, y)
+        self.classes_ = self.calibrated_.classes_
+        return self
+
+    def decision_function(self, X):
+        # Mode prefit hanya punya satu SVM; mode CV dirata-rata antar fold
+        return np.mean([c.estimator.decision_function(X) for c in self.calibrated_.calibrated_classifiers_], axis=0)
+
+    def predict_proba(self, X):
+        return self.calibrated_.predict_proba(X)
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
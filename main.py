@@ -5,13 +5,14 @@ import home
 import scraping as scraping
 import modeling
 import preprocesing
+import batch_inference
 
 
 st.sidebar.image("sentilab.png")
 st.sidebar.title("Navigation")
 
 
-pages = ['Home', 'Scraping Komentar', 'Preprocessing', 'Modeling']
+pages = ['Home', 'Scraping Komentar', 'Preprocessing', 'Modeling', 'Prediksi Batch']
 selected_page = st.sidebar.selectbox("Menu", pages)
 
 if selected_page == 'Home':
@@ -25,3 +26,6 @@ elif selected_page == 'Preprocessing':
 
 elif selected_page == 'Modeling':
     modeling.show()
+
+elif selected_page == 'Prediksi Batch':
+    batch_inference.show()
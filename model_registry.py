@@ -0,0 +1,143 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from functools import lru_cache
+
+import joblib
+import sklearn
+
+REGISTRY_DIR = "models"
+MODEL_FILE = "model.joblib"
+METADATA_FILE = "metadata.json"
+
+
+def slugify(name):
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "model"
+
+
+def _versions(model_dir):
+    if not os.path.isdir(model_dir):
+        return []
+    return sorted(int(d[1:]) for d in os.listdir(model_dir) if re.fullmatch(r"v\d+", d))
+
+
+def _read_metadata(version_dir):
+    with open(os.path.join(version_dir, METADATA_FILE), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def list_models(registry_dir=REGISTRY_DIR):
+    # Metadata semua versi, terbaru lebih dulu
+    entries = []
+    if not os.path.isdir(registry_dir):
+        return entries
+    for slug in sorted(os.listdir(registry_dir)):
+        model_dir = os.path.join(registry_dir, slug)
+        for version in _versions(model_dir):
+            try:
+                entries.append(_read_metadata(os.path.join(model_dir, f"v{version}")))
+            except (OSError, ValueError):
+                continue
+    return sorted(entries, key=lambda m: m.get("created_at", ""), reverse=True)
+
+
+def find_version(name, fingerprint, registry_dir=REGISTRY_DIR):
+    model_dir = os.path.join(registry_dir, slugify(name))
+    for version in reversed(_versions(model_dir)):
+        try:
+            metadata = _read_metadata(os.path.join(model_dir, f"v{version}"))
+        except (OSError, ValueError):
+            continue
+        if metadata.get("fingerprint") == fingerprint:
+            return metadata
+    return None
+
+
+# Parameter yang tidak memengaruhi hasil model, tidak ikut sidik
+RUNTIME_PARAMS = {"n_jobs", "verbose", "max_memory_mb"}
+
+
+def estimator_params(pipeline):
+    # Parameter classifier (langkah terakhir pipeline), mis. k atau dimensi SVD dari sidebar
+    estimator = pipeline.steps[-1][1] if hasattr(pipeline, "steps") else pipeline
+    if not hasattr(estimator, "get_params"):
+        return {}
+    return {
+        key: value for key, value in estimator.get_params(deep=False).items()
+        if key not in RUNTIME_PARAMS
+    }
+
+
+def save_model(name, pipeline, dataset_hash, metrics=None, train_seconds=None, params=None,
+               registry_dir=REGISTRY_DIR):
+    # Pipeline (vectorizer + classifier) disimpan tanpa kompresi agar array numpy
+    # di dalamnya bisa di-memory-map saat dimuat. Model yang identik (dataset,
+    # nama, parameter halaman dan parameter estimator sama) tidak disimpan ulang.
+    params = dict(params or {})
+    estimator = json.loads(json.dumps(estimator_params(pipeline), sort_keys=True, default=str))
+    fingerprint = f"{dataset_hash}:{slugify(name)}:{json.dumps([params, estimator], sort_keys=True, default=str)}"
+    existing = find_version(name, fingerprint, registry_dir)
+    if existing is not None:
+        return existing
+
+    model_dir = os.path.join(registry_dir, slugify(name))
+    os.makedirs(model_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".staging-", dir=model_dir)
+    try:
+        start = time.perf_counter()
+        joblib.dump(pipeline, os.path.join(staging, MODEL_FILE))
+        metadata = {
+            "name": name,
+            "dataset_hash": dataset_hash,
+            "fingerprint": fingerprint,
+            "metrics": dict(metrics or {}),
+            "train_seconds": train_seconds,
+            "save_seconds": time.perf_counter() - start,
+            "params": params,
+            "estimator_params": estimator,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "sklearn_version": sklearn.__version__,
+            "size_bytes": os.path.getsize(os.path.join(staging, MODEL_FILE)),
+        }
+        # Nomor versi diklaim lewat rename atomik, aman jika beberapa proses menyimpan bersamaan
+        version = (_versions(model_dir) or [0])[-1] + 1
+        while True:
+            metadata["version"] = version
+            metadata["path"] = os.path.join(model_dir, f"v{version}")
+            with open(os.path.join(staging, METADATA_FILE), 'w', encoding='utf-8') as f:
+                json.dump(metadata, f, indent=2, default=str)
+            try:
+                os.rename(staging, metadata["path"])
+                return metadata
+            except OSError:
+                if not os.path.isdir(metadata["path"]):
+                    raise
+                version += 1
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+@lru_cache(maxsize=8)
+def _load(path, mtime_ns, mmap):
+    # mmap_mode='r': array besar (idf, koefisien, support vector, node pohon) dibaca
+    # langsung dari page cache OS, sehingga beberapa proses server berbagi satu salinan.
+    # Vocabulary TF-IDF berupa dict Python tetap dimuat ke memori tiap proses.
+    return joblib.load(path, mmap_mode="r" if mmap else None)
+
+
+def load_model(name, version=None, mmap=True, registry_dir=REGISTRY_DIR):
+    # version=None memuat versi terbaru; mengembalikan (pipeline, metadata)
+    model_dir = os.path.join(registry_dir, slugify(name))
+    versions = _versions(model_dir)
+    if not versions:
+        raise FileNotFoundError(f"Model '{name}' belum ada di registry {registry_dir}")
+    version = versions[-1] if version is None else int(version)
+    version_dir = os.path.join(model_dir, f"v{version}")
+    path = os.path.join(version_dir, MODEL_FILE)
+    pipeline = _load(path, os.stat(path).st_mtime_ns, bool(mmap))
+    return pipeline, _read_metadata(version_dir)
@@ -1,18 +1,47 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from wordcloud import WordCloud
 from sklearn.model_selection import train_test_split
 from sklearn.naive_bayes import MultinomialNB
 from sklearn.svm import SVC
 from sklearn.ensemble import RandomForestClassifier, AdaBoostClassifier
 from sklearn.neighbors import KNeighborsClassifier
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-from sklearn.feature_extraction.text import TfidfVectorizer
-from imblearn.over_sampling import RandomOverSampler
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
 import numpy as np
 import io
+import hashlib
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from features import oversample_sparse, matrix_stats, share_csr, attach_csr, release, classification_scores
+from artifacts import artifact_cache, dataset_hash
+from sklearn.pipeline import Pipeline
+import model_registry
+from incremental import train_incremental, INCREMENTAL_MODELS, DEFAULT_CHUNK_SIZE, HASH_FEATURES
+from tuning import PARAM_GRIDS, tune_model
+from linear_svm import build_linear_svm, CalibratedLinearSVC
+from knn import CosineKNN, DEFAULT_COMPONENTS, DEFAULT_MAX_MEMORY_MB
+from charts import render, term_frequencies, wordcloud_from, accuracy_chart_png, distribution_chart_png
+from telemetry import StageMonitor, append_history, load_history
+
+MODEL_NAMES = ['Naive Bayes', 'SVM', 'Random Forest', 'AdaBoost', 'KNN']
+# Model paling lama dikirim lebih dulu agar worker tidak menganggur di akhir
+SUBMIT_ORDER = [
+    'Random Forest', 'SVM', 'AdaBoost', 'KNN', 'KNN Cosine', 'KNN SVD',
+    'SVM Linear (Kalibrasi)', 'SVM Linear', 'Naive Bayes'
+]
+# Varian SVM yang bisa dipilih; SVM linear jauh lebih cepat untuk TF-IDF berdimensi tinggi
+SVM_VARIANTS = {
+    'Kernel RBF (SVC)': 'SVM',
+    'Linear (LinearSVC)': 'SVM Linear',
+    'Linear + Kalibrasi Probabilitas': 'SVM Linear (Kalibrasi)',
+}
+# Varian KNN: cosine sparse memberi tetangga yang sama dengan brute-force cosine tanpa
+# densifikasi; SVD mereduksi dimensi lalu memakai indeks pohon (aproksimasi, paling cepat)
+KNN_VARIANTS = {
+    'Euclidean Brute-force (scikit-learn)': 'KNN',
+    'Cosine Sparse (eksak, per blok)': 'KNN Cosine',
+    'Cosine SVD + KDTree (aproksimasi)': 'KNN SVD',
+}
 
 @st.cache_data
 def load_data(uploaded_file):
@@ -26,33 +55,445 @@ def load_data(uploaded_file):
             return pd.read_json(uploaded_file)
         elif file_extension == 'txt':
             return pd.read_csv(uploaded_file, sep="\t")
+        elif file_extension == 'parquet':
+            return pd.read_parquet(uploaded_file)
         else:
             return None
     except Exception as e:
         st.error(f"❌ Gagal memuat file: {e}")
         return None
 
-def train_model(model_name, X_train, X_test, y_train, y_test):
+def build_model(model_name, n_jobs=None, params=None):
     models = {
-        'Naive Bayes': MultinomialNB(),
-        'SVM': SVC(),
-        'Random Forest': RandomForestClassifier(),
-        'AdaBoost': AdaBoostClassifier(),
-        'KNN': KNeighborsClassifier(),
+        'Naive Bayes': MultinomialNB,
+        'SVM': SVC,
+        'SVM Linear': build_linear_svm,
+        'SVM Linear (Kalibrasi)': CalibratedLinearSVC,
+        'Random Forest': lambda: RandomForestClassifier(n_jobs=n_jobs),
+        'AdaBoost': AdaBoostClassifier,
+        'KNN': lambda: KNeighborsClassifier(n_jobs=n_jobs),
+        'KNN Cosine': CosineKNN,
+        'KNN SVD': lambda: CosineKNN(mode='svd'),
     }
-    model = models.get(model_name)
+    factory = models.get(model_name)
+    if factory is None:
+        return None
+    model = factory()
+    if params:
+        model.set_params(**params)
+    return model
+
+def fit_model(model_name, X_train, y_train, n_jobs=None, params=None):
+    model = build_model(model_name, n_jobs, params)
+    if model is not None:
+        model.fit(X_train, y_train)
+    return model
+
+def evaluate_model(model, X_test, y_test):
+    y_pred = model.predict(X_test)
+    return classification_scores(y_test, y_pred)
+
+def train_model(model_name, X_train, X_test, y_train, y_test, n_jobs=None):
+    model = fit_model(model_name, X_train, y_train, n_jobs)
     if model is None:
         return None, None, None, None
+    return evaluate_model(model, X_test, y_test)
 
-    model.fit(X_train, y_train)
-    y_pred = model.predict(X_test)
+def _fit_and_score(model_name, X_train, X_test, y_train, y_test, n_jobs=None, params=None, trace_memory=False):
+    # Mengembalikan (model, skor, telemetri); telemetri berisi waktu dan memori tahap fit/prediksi
+    with StageMonitor(trace_memory=trace_memory) as fit:
+        model = fit_model(model_name, X_train, y_train, n_jobs, params)
+    if model is None:
+        return None, (None, None, None, None), {"fit": fit.as_dict()}
+    with StageMonitor(trace_memory=trace_memory) as predict:
+        y_pred = model.predict(X_test)
+    return model, classification_scores(y_test, y_pred), {"fit": fit.as_dict(), "predict": predict.as_dict()}
+
+def telemetry_columns(telemetry):
+    # Kolom tabel performa; memori puncak diambil yang terbesar antara fit dan prediksi
+    stages = [telemetry.get("fit") or {}, telemetry.get("predict") or {}]
+
+    def peak(key):
+        values = [stage.get(key) for stage in stages if stage.get(key) is not None]
+        return max(values) if values else None
+
+    return {
+        'Waktu Fit (dtk)': stages[0].get("seconds"),
+        'Waktu Prediksi (dtk)': stages[1].get("seconds"),
+        'Puncak RSS (MB)': peak("rss_peak_mb"),
+        'Tambahan RSS (MB)': peak("rss_delta_mb"),
+        'Puncak tracemalloc (MB)': peak("traced_peak_mb"),
+    }
+
+def plan_cores(budget, n_models):
+    # Proses dibatasi anggaran core; sisa core diberikan ke Random Forest yang
+    # multi-thread sehingga total thread tidak melebihi anggaran
+    budget = max(1, int(budget))
+    processes = min(budget, n_models)
+    return processes, max(1, budget - processes + 1)
+
+_shared = {}
+
+def _init_worker(train_spec, test_spec, y_train, y_test):
+    train_blocks, X_train = attach_csr(train_spec)
+    test_blocks, X_test = attach_csr(test_spec)
+    _shared.update(
+        blocks=train_blocks + test_blocks,
+        X_train=X_train, X_test=X_test, y_train=y_train, y_test=y_test
+    )
+
+def _train_shared(model_name, n_jobs, params=None, trace_memory=False):
+    return _fit_and_score(
+        model_name, _shared["X_train"], _shared["X_test"], _shared["y_train"], _shared["y_test"], n_jobs, params,
+        trace_memory
+    )
+
+def train_models(model_names, X_train, X_test, y_train, y_test, budget=1, parallel=False, on_done=None,
+                 model_params=None, trace_memory=False):
+    # Mengembalikan ({nama: (model, skor, detik)}, {nama: exception}); on_done dipanggil setiap satu model selesai.
+    # model_params: {nama: parameter estimator} yang menimpa bawaan build_model
+    results, errors = {}, {}
+    model_params = model_params or {}
+
+    def finish(name, outcome=None, error=None):
+        if error is None:
+            results[name] = outcome
+        else:
+            errors[name] = error
+        if on_done is not None:
+            on_done(name, len(results) + len(errors), error)
+
+    ordered = [name for name in SUBMIT_ORDER if name in model_names]
+    ordered += [name for name in model_names if name not in ordered]
+
+    if not parallel or len(ordered) < 2:
+        for name in ordered:
+            try:
+                finish(name, _fit_and_score(
+                    name, X_train, X_test, y_train, y_test, budget, model_params.get(name), trace_memory
+                ))
+            except Exception as e:
+                finish(name, error=e)
+        return results, errors
+
+    processes, threads = plan_cores(budget, len(ordered))
+    train_blocks, train_spec = share_csr(X_train)
+    test_blocks, test_spec = share_csr(X_test)
+    try:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=processes, mp_context=context,
+            initializer=_init_worker, initargs=(train_spec, test_spec, y_train, y_test)
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _train_shared, name, threads if name == 'Random Forest' else 1, model_params.get(name),
+                    trace_memory
+                ): name
+                for name in ordered
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    finish(name, future.result())
+                except Exception as e:
+                    finish(name, error=e)
+    finally:
+        release(train_blocks + test_blocks)
+    return results, errors
+
+def prepare_features(X, y):
+    # TF-IDF -> split -> oversampling; None jika gagal (pesan error sudah ditampilkan)
+    try:
+        with StageMonitor() as vectorize:
+            # Setara TfidfVectorizer, tetapi matriks hitungan kata disimpan untuk word cloud
+            # sehingga korpus tidak perlu ditokenisasi ulang
+            vectorizer = Pipeline([("counts", CountVectorizer()), ("tfidf", TfidfTransformer())])
+            counts = vectorizer.named_steps["counts"].fit_transform(X)
+            X_tfidf = vectorizer.named_steps["tfidf"].fit_transform(counts)
+    except Exception as e:
+        st.error(f"❌ Gagal melakukan TF-IDF: {e}")
+        return None
 
-    accuracy = accuracy_score(y_test, y_pred)
-    precision = precision_score(y_test, y_pred, average='weighted', zero_division=1)
-    recall = recall_score(y_test, y_pred, average='weighted', zero_division=1)
-    f1 = f1_score(y_test, y_pred, average='weighted', zero_division=1)
+    try:
+        X_train, X_test, y_train, y_test = train_test_split(
+            X_tfidf, y, test_size=0.2, random_state=42, stratify=y
+        )
+    except Exception as e:
+        st.error(f"❌ Gagal membagi data: {e}")
+        return None
+
+    if X_train.shape[0] < 2:
+        st.error("❌ Jumlah data pelatihan terlalu sedikit.")
+        return None
+
+    if len(np.unique(y_train)) < 2:
+        st.error("❌ Data pelatihan hanya memiliki satu kelas. Oversampling memerlukan dua kelas atau lebih.")
+        return None
 
-    return accuracy, precision, recall, f1
+    try:
+        # Matriks TF-IDF tetap CSR: densifikasi 200k x 60k fitur bisa memakan puluhan GB
+        with StageMonitor() as oversample:
+            X_train_resampled, y_train_resampled = oversample_sparse(X_train, y_train, random_state=42)
+    except Exception as e:
+        st.error(f"❌ Gagal melakukan oversampling: {e}")
+        return None
+
+    return {
+        "vectorizer": vectorizer,
+        "counts": counts,
+        "X_train_raw": X_train.tocsr(),
+        "y_train_raw": y_train,
+        "X_train": X_train_resampled,
+        "y_train": y_train_resampled,
+        "X_test": X_test.tocsr(),
+        "y_test": y_test,
+        "telemetry": {"vectorize": vectorize.as_dict(), "oversample": oversample.as_dict()},
+    }
+
+def show_registry_form(results, vectorizer, data_key, params=None, form_key="save_model", model_params=None):
+    st.subheader("💾 Simpan Model ke Registry")
+    with st.form(form_key):
+        model_name = st.selectbox("Pilih model", list(results))
+        submitted = st.form_submit_button("Simpan Model")
+
+    if submitted:
+        model, (accuracy, precision, recall, f1), telemetry = results[model_name]
+        params = dict(params or {"page": "modeling", "test_size": 0.2, "random_state": 42, "oversampling": "random"})
+        if (model_params or {}).get(model_name):
+            params["model_params"] = model_params[model_name]
+        try:
+            metadata = model_registry.save_model(
+                model_name,
+                Pipeline([("tfidf", vectorizer), ("model", model)]),
+                data_key,
+                metrics={'Akurasi': accuracy, 'Precision': precision, 'Recall': recall, 'F1-Score': f1},
+                train_seconds=telemetry["fit"]["seconds"],
+                params=params,
+            )
+            st.success(f"✅ Model {model_name} tersimpan sebagai versi {metadata['version']} ({metadata['path']})")
+        except Exception as e:
+            st.error(f"❌ Gagal menyimpan model: {e}")
+
+def upload_hash(uploaded_file):
+    # Sidik isi file unggahan (byte mentah), dihitung sekali per unggahan
+    key = (getattr(uploaded_file, "file_id", None) or uploaded_file.name, uploaded_file.size)
+    cached = st.session_state.get("upload_hash")
+    if cached is None or cached[0] != key:
+        h = hashlib.sha1()
+        uploaded_file.seek(0)
+        for block in iter(lambda: uploaded_file.read(1024 ** 2), b""):
+            h.update(block)
+        uploaded_file.seek(0)
+        cached = (key, h.hexdigest())
+        st.session_state.upload_hash = cached
+    return cached[1]
+
+def show_out_of_core(uploaded_file):
+    # Data dibaca per chunk dengan HashingVectorizer + partial_fit, sehingga ukuran
+    # dataset tidak dibatasi RAM (hanya chunk dan data uji yang ada di memori)
+    fmt = uploaded_file.name.split('.')[-1].lower()
+    if fmt not in ("csv", "parquet"):
+        st.error("❌ Mode out-of-core hanya mendukung file CSV atau Parquet.")
+        return
+
+    st.sidebar.header("⚙️ Pengaturan Out-of-core")
+    model_names = st.sidebar.multiselect("Model", INCREMENTAL_MODELS, default=INCREMENTAL_MODELS)
+    chunk_size = st.sidebar.number_input("Baris per Chunk", min_value=1000, value=DEFAULT_CHUNK_SIZE, step=1000)
+    epochs = st.sidebar.number_input("Jumlah Epoch", min_value=1, max_value=20, value=1)
+    test_size = st.sidebar.slider("Ukuran Data Uji (%)", 5, 50, 20)
+
+    if st.button("Jalankan Analisis (Out-of-core)"):
+        if not model_names:
+            st.error("❌ Pilih minimal satu model.")
+            return
+        bar = st.progress(0.0, text="Membaca distribusi label...")
+
+        def report(epoch, chunk_no, rows_train, rows_holdout):
+            bar.progress(min(epoch / epochs, 1.0), text=(
+                f"Epoch {epoch}/{epochs}, chunk {chunk_no}: {rows_train:,} baris latih, {rows_holdout:,} baris uji"
+            ))
+
+        try:
+            result = train_incremental(
+                uploaded_file, fmt, model_names, int(chunk_size), test_size / 100, epochs=int(epochs), progress=report
+            )
+        except Exception as e:
+            st.error(f"❌ Gagal melatih model out-of-core: {e}")
+            return
+        bar.empty()
+        result["params"] = {
+            "page": "modeling-out-of-core", "test_size": test_size / 100, "epochs": int(epochs),
+            "n_features": HASH_FEATURES, "class_weight": "balanced"
+        }
+        result["upload_hash"] = upload_hash(uploaded_file)
+        st.session_state.out_of_core_result = result
+
+    result = st.session_state.get("out_of_core_result")
+    if result is None:
+        return
+    if result.get("upload_hash") != upload_hash(uploaded_file):
+        # Hasil milik file sebelumnya; tidak ditampilkan untuk file yang baru diunggah
+        del st.session_state.out_of_core_result
+        return
+
+    st.success(
+        f"✅ {result['rows_train']:,} baris latih dan {result['rows_holdout']:,} baris uji "
+        f"diproses dalam {result['total_seconds']:.1f} detik."
+    )
+    metrics_df = pd.DataFrame([
+        {
+            'Model': name,
+            'Akurasi': accuracy,
+            'Precision': precision,
+            'Recall': recall,
+            'F1-Score': f1,
+            'Kualitas': model_quality(accuracy)
+        }
+        for name, (accuracy, precision, recall, f1) in result["metrics"].items()
+    ])
+    st.subheader("📊 Perbandingan Performa Model")
+    st.dataframe(metrics_df.style.format({
+        'Akurasi': '{:.2%}',
+        'Precision': '{:.2%}',
+        'Recall': '{:.2%}',
+        'F1-Score': '{:.2%}'
+    }), use_container_width=True)
+    st.caption("Distribusi label: " + ", ".join(f"{k}: {v:,}" for k, v in result["class_counts"].items()))
+
+    results = {
+        name: (model, result["metrics"][name], {"fit": {"seconds": result["seconds"][name]}})
+        for name, model in result["models"].items()
+    }
+    show_registry_form(results, result["vectorizer"], result["data_key"], result["params"], "save_model_ooc")
+
+def show_tuning(features, features_key, budget, model_params=None):
+    st.subheader("🎯 Tuning Hyperparameter (Successive Halving)")
+    with st.form("tuning"):
+        model_names = st.multiselect("Model", list(PARAM_GRIDS), default=MODEL_NAMES)
+        cv = st.number_input("Jumlah Fold CV", min_value=2, max_value=10, value=5)
+        submitted = st.form_submit_button("Jalankan Tuning")
+    if submitted:
+        st.session_state.tuning_request = (tuple(model_names), int(cv))
+        # Tuning yang gagal hanya diulang jika form dikirim lagi, tidak di setiap rerun
+        st.session_state.tuning_errors = {}
+    errors = st.session_state.setdefault("tuning_errors", {})
+
+    request = st.session_state.get("tuning_request")
+    if not request or not request[0]:
+        return
+    model_names, cv = request
+
+    rows = []
+    progress = st.progress(0.0, text="Menyiapkan tuning...")
+    for i, model_name in enumerate(model_names):
+        params = (model_params or {}).get(model_name)
+        key = (features_key, "tuning", model_name, cv, tuple(sorted((params or {}).items())))
+        if key in errors:
+            st.warning(f"⚠️ Tuning {model_name} gagal: {errors[key]}")
+            continue
+        result = artifact_cache.get(key)
+        if result is None:
+            progress.progress(i / len(model_names), text=f"Tuning {model_name} ({budget} core)...")
+            try:
+                # Kandidat dievaluasi paralel oleh search, jadi model sendiri dibuat single-thread
+                result = tune_model(
+                    build_model(model_name, n_jobs=1, params=params), PARAM_GRIDS[model_name],
+                    features["X_train_raw"], features["y_train_raw"], features["X_test"], features["y_test"],
+                    cv=cv, n_jobs=budget
+                )
+            except Exception as e:
+                errors[key] = str(e)
+                st.warning(f"⚠️ Tuning {model_name} gagal: {e}")
+                continue
+            artifact_cache.put(key, result)
+        accuracy, precision, recall, f1 = result["test_scores"]
+        rows.append({
+            'Model': model_name,
+            'Parameter Terbaik': ", ".join(f"{k}={v}" for k, v in result["best_params"].items()),
+            'F1 CV (rata-rata)': result["cv_mean"],
+            'F1 CV (std)': result["cv_std"],
+            'Akurasi Uji': accuracy,
+            'F1 Uji': f1,
+            'Kandidat': result["n_candidates"],
+            'Iterasi Halving': result["n_iterations"],
+            'Waktu (detik)': result["seconds"],
+        })
+    progress.empty()
+
+    if rows:
+        st.dataframe(pd.DataFrame(rows).style.format({
+            'F1 CV (rata-rata)': '{:.2%}',
+            'F1 CV (std)': '{:.2%}',
+            'Akurasi Uji': '{:.2%}',
+            'F1 Uji': '{:.2%}',
+            'Waktu (detik)': '{:.1f}'
+        }), use_container_width=True)
+        st.caption(f"Validasi silang {cv}-fold (stratified) pada data latih; oversampling dilakukan di dalam setiap fold.")
+
+def drop_untraced(df):
+    # Kolom tracemalloc hanya ditampilkan jika pengukurannya diaktifkan
+    column = 'Puncak tracemalloc (MB)'
+    if column in df and df[column].isna().all():
+        return df.drop(columns=[column])
+    return df
+
+def stage_table(stages):
+    names = {"vectorize": "Vektorisasi TF-IDF", "oversample": "Oversampling"}
+    return drop_untraced(pd.DataFrame([
+        {
+            'Tahap': names.get(key, key),
+            'Waktu (dtk)': stage.get("seconds"),
+            'Puncak RSS (MB)': stage.get("rss_peak_mb"),
+            'Tambahan RSS (MB)': stage.get("rss_delta_mb"),
+            'Puncak tracemalloc (MB)': stage.get("traced_peak_mb"),
+        }
+        for key, stage in stages.items()
+    ]))
+
+def log_run(data_key, rows, features, results, errors, parallel, budget):
+    # Dipanggil hanya jika model benar-benar dilatih (bukan dari cache)
+    stats = matrix_stats(features["X_train"], "Latih")
+    append_history({
+        "page": "modeling",
+        "dataset_hash": data_key,
+        "rows": rows,
+        "parallel": bool(parallel),
+        "budget": int(budget),
+        "matrix": {"rows": stats["Baris"], "features": stats["Fitur"], "nnz": stats["Nilai Non-Nol"],
+                   "density": stats["Kepadatan"]},
+        "stages": features["telemetry"],
+        "models": {
+            name: {"scores": dict(zip(['accuracy', 'precision', 'recall', 'f1'], scores)), **telemetry}
+            for name, (_, scores, telemetry) in results.items()
+        },
+        "errors": {name: str(e) for name, e in errors.items()},
+    })
+
+def show_history(limit=50):
+    rows = []
+    for entry in reversed(load_history(limit=limit)):
+        for name, model in entry.get("models", {}).items():
+            rows.append({
+                'Waktu': entry.get("timestamp"),
+                'Dataset': str(entry.get("dataset_hash", ""))[:8],
+                'Baris': entry.get("rows"),
+                'Mode': "paralel" if entry.get("parallel") else "berurutan",
+                'Model': name,
+                'F1-Score': model.get("scores", {}).get("f1"),
+                **telemetry_columns(model),
+            })
+    if not rows:
+        st.info("Belum ada riwayat run.")
+        return
+    st.dataframe(drop_untraced(pd.DataFrame(rows)).style.format({
+        'F1-Score': '{:.2%}',
+        'Waktu Fit (dtk)': '{:.2f}',
+        'Waktu Prediksi (dtk)': '{:.2f}',
+        'Puncak RSS (MB)': '{:.0f}',
+        'Tambahan RSS (MB)': '{:.0f}',
+        'Puncak tracemalloc (MB)': '{:.1f}'
+    }, na_rep='-'), use_container_width=True)
 
 def model_quality(accuracy):
     if accuracy == 1:
@@ -64,18 +505,16 @@ def model_quality(accuracy):
     else:
         return "Cukup"
 
-def fig_to_bytes(fig):
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", bbox_inches="tight")
-    buf.seek(0)
-    return buf
-
 def show():
     st.title("📊 Dashboard Analisis Sentimen")
 
-    uploaded_file = st.file_uploader("Unggah dataset (CSV, Excel, JSON, TXT)", type=["csv", "xlsx", "json", "txt"])
+    uploaded_file = st.file_uploader("Unggah dataset (CSV, Excel, JSON, TXT, Parquet)", type=["csv", "xlsx", "json", "txt", "parquet"])
 
     if uploaded_file is not None:
+        if st.sidebar.checkbox("Mode Out-of-core (file besar)"):
+            show_out_of_core(uploaded_file)
+            return
+
         data = load_data(uploaded_file)
 
         if data is None or 'Komentar' not in data.columns or 'Label' not in data.columns:
@@ -86,6 +525,31 @@ def show():
         X = data['Komentar']
         y = data['Label']
 
+        st.sidebar.header("🚀 Mode Paralel")
+        cores = os.cpu_count() or 1
+        use_parallel = st.sidebar.checkbox("Latih Model Secara Paralel")
+        budget = st.sidebar.number_input("Anggaran Core", min_value=1, max_value=cores, value=cores)
+        svm_variant = st.sidebar.selectbox("Varian SVM", list(SVM_VARIANTS))
+        knn_variant = st.sidebar.selectbox("Varian KNN", list(KNN_VARIANTS))
+        knn_name = KNN_VARIANTS[knn_variant]
+        model_params = {}
+        if knn_name != 'KNN':
+            with st.sidebar.expander("⚙️ Pengaturan KNN"):
+                knn_params = {
+                    'max_memory_mb': st.number_input(
+                        "Batas Memori per Blok (MB)", min_value=16, value=DEFAULT_MAX_MEMORY_MB, step=16
+                    )
+                }
+                if knn_name == 'KNN SVD':
+                    knn_params['n_components'] = st.number_input(
+                        "Dimensi SVD", min_value=2, max_value=1000, value=DEFAULT_COMPONENTS,
+                        help="Lebih kecil = lebih cepat; lebih besar = lebih mendekati hasil eksak"
+                    )
+            model_params[knn_name] = {key: int(value) for key, value in knn_params.items()}
+        trace_memory = st.sidebar.checkbox(
+            "Ukur Alokasi Python (tracemalloc)", help="Menambah kolom puncak tracemalloc; pelatihan 5-10% lebih lambat"
+        )
+
         if 'run_analysis' not in st.session_state:
             st.session_state.run_analysis = False
 
@@ -93,69 +557,107 @@ def show():
             st.session_state.run_analysis = True
 
         if st.session_state.run_analysis:
+            # Hasil TF-IDF, split, oversampling dan model disimpan per (isi dataset, parameter),
+            # sehingga rerun karena interaksi widget hanya menggambar ulang grafik
+            data_key = dataset_hash(X, y)
+            features_key = ("modeling-features", data_key, 0.2, 42)
             with st.spinner("Memproses data..."):
-                try:
-                    vectorizer = TfidfVectorizer()
-                    X_tfidf = vectorizer.fit_transform(X)
-                except Exception as e:
-                    st.error(f"❌ Gagal melakukan TF-IDF: {e}")
-                    return
+                features = artifact_cache.get_or_build(features_key, lambda: prepare_features(X, y))
+            if features is None:
+                return
+            X_train_resampled, y_train_resampled = features["X_train"], features["y_train"]
+            X_test, y_test = features["X_test"], features["y_test"]
+
+            with st.expander("🧮 Ukuran Matriks Fitur"):
+                stats_df = pd.DataFrame([
+                    matrix_stats(X_train_resampled, "Latih (setelah oversampling)"),
+                    matrix_stats(X_test, "Uji"),
+                ])
+                st.dataframe(stats_df.style.format({
+                    'Kepadatan': '{:.4%}',
+                    'Memori (MB)': '{:.2f}',
+                    'Memori jika Dense (MB)': '{:.2f}'
+                }), use_container_width=True)
 
-                try:
-                    X_train, X_test, y_train, y_test = train_test_split(
-                        X_tfidf, y, test_size=0.2, random_state=42, stratify=y
-                    )
-                except Exception as e:
-                    st.error(f"❌ Gagal membagi data: {e}")
-                    return
+            variants = {'SVM': SVM_VARIANTS[svm_variant], 'KNN': knn_name}
+            model_names = [variants.get(name, name) for name in MODEL_NAMES]
+            metrics = []
 
-                if X_train.shape[0] < 2:
-                    st.error("❌ Jumlah data pelatihan terlalu sedikit.")
-                    return
+            params_key = tuple((name, tuple(sorted(params.items()))) for name, params in sorted(model_params.items()))
+            models_key = (features_key, tuple(model_names), params_key, trace_memory)
+            trained = artifact_cache.get(models_key)
+            if trained is None:
+                mode = f"paralel, {budget} core" if use_parallel else "berurutan"
+                progress = st.progress(0.0, text=f"Melatih {len(model_names)} model ({mode})...")
 
-                if len(np.unique(y_train)) < 2:
-                    st.error("❌ Data pelatihan hanya memiliki satu kelas. Oversampling memerlukan dua kelas atau lebih.")
-                    return
+                def report(model_name, done, error):
+                    status = "gagal" if error is not None else "selesai"
+                    progress.progress(done / len(model_names), text=f"{model_name} {status} ({done}/{len(model_names)})")
 
                 try:
-                    X_train_array = X_train.toarray()
-                    X_test_array = X_test.toarray()
-                    ros = RandomOverSampler(random_state=42)
-                    X_train_resampled, y_train_resampled = ros.fit_resample(X_train_array, y_train)
+                    results, errors = train_models(
+                        model_names, X_train_resampled, X_test, y_train_resampled, y_test,
+                        budget=budget, parallel=use_parallel, on_done=report, model_params=model_params,
+                        trace_memory=trace_memory
+                    )
                 except Exception as e:
-                    st.error(f"❌ Gagal melakukan oversampling: {e}")
+                    st.error(f"❌ Gagal menjalankan pelatihan paralel: {e}")
                     return
-
-            model_names = ['Naive Bayes', 'SVM', 'Random Forest', 'AdaBoost', 'KNN']
-            metrics = []
-
+                progress.empty()
+                # Hanya hasil tanpa kegagalan yang disimpan, agar model yang gagal dicoba lagi
+                if not errors:
+                    artifact_cache.put(models_key, (results, errors))
+                try:
+                    log_run(data_key, len(X), features, results, errors, use_parallel, budget)
+                except OSError as e:
+                    st.warning(f"⚠️ Gagal menulis riwayat run: {e}")
+            else:
+                results, errors = trained
+                st.caption("♻️ Model dan matriks fitur diambil dari cache (dataset dan parameter tidak berubah).")
+
+            train_stats = matrix_stats(X_train_resampled, "Latih")
             for model_name in model_names:
-                with st.spinner(f"Melatih model {model_name}..."):
-                    try:
-                        accuracy, precision, recall, f1 = train_model(
-                            model_name, X_train_resampled, X_test_array, y_train_resampled, y_test
-                        )
-                        if accuracy is not None:
-                            metrics.append({
-                                'Model': model_name,
-                                'Akurasi': accuracy,
-                                'Precision': precision,
-                                'Recall': recall,
-                                'F1-Score': f1,
-                                'Kualitas': model_quality(accuracy)
-                            })
-                    except Exception as e:
-                        st.warning(f"⚠️ Model {model_name} gagal dilatih: {e}")
+                if model_name in errors:
+                    st.warning(f"⚠️ Model {model_name} gagal dilatih: {errors[model_name]}")
+                    continue
+                _, (accuracy, precision, recall, f1), telemetry = results[model_name]
+                if accuracy is not None:
+                    metrics.append({
+                        'Model': model_name,
+                        'Akurasi': accuracy,
+                        'Precision': precision,
+                        'Recall': recall,
+                        'F1-Score': f1,
+                        'Kualitas': model_quality(accuracy),
+                        **telemetry_columns(telemetry),
+                        'Baris Latih': train_stats['Baris'],
+                        'Fitur': train_stats['Fitur'],
+                        'Kepadatan': train_stats['Kepadatan'],
+                    })
 
             if not metrics:
                 st.error("❌ Semua model gagal dilatih.")
                 return
 
             st.success("✅ Semua model selesai dievaluasi!")
-            metrics_df = pd.DataFrame(metrics)
+            metrics_df = drop_untraced(pd.DataFrame(metrics))
+
+            # Semua grafik mulai dirender di latar belakang (atau diambil dari cache) sebelum
+            # tabel, form registry dan tuning digambar; hasilnya ditampilkan sebagai PNG
+            frequencies = render((data_key, "frequencies"), term_frequencies, features["counts"], y,
+                                 features["vectorizer"].named_steps["counts"].vocabulary_)
+            charts = {
+                "all": render((data_key, "wordcloud", None), wordcloud_from, frequencies, None, 800, 400),
+                "accuracy": render(("accuracy", tuple(map(tuple, metrics_df[['Model', 'Akurasi']].values))),
+                                   accuracy_chart_png, metrics_df),
+                "distribution": render((data_key, "distribution"), distribution_chart_png, y.value_counts()),
+            }
+            for label, color in [("positif", "Greens"), ("negatif", "Reds"), ("netral", "Blues")]:
+                charts[label] = render((data_key, "wordcloud", label), wordcloud_from, frequencies, label, 400, 300, color)
 
             # Ubah nilai metrik menjadi persentase (tetap dalam bentuk desimal 0.xx untuk formatting Excel)
             col_list = ['Akurasi', 'Precision', 'Recall', 'F1-Score']
+            stages_df = stage_table(features["telemetry"])
 
             col1, col2 = st.columns(2)
 
@@ -165,19 +667,35 @@ def show():
                     'Akurasi': '{:.2%}',
                     'Precision': '{:.2%}',
                     'Recall': '{:.2%}',
-                    'F1-Score': '{:.2%}'
-                }), use_container_width=True)
+                    'F1-Score': '{:.2%}',
+                    'Waktu Fit (dtk)': '{:.2f}',
+                    'Waktu Prediksi (dtk)': '{:.2f}',
+                    'Puncak RSS (MB)': '{:.0f}',
+                    'Tambahan RSS (MB)': '{:.0f}',
+                    'Puncak tracemalloc (MB)': '{:.1f}',
+                    'Kepadatan': '{:.4%}'
+                }, na_rep='-'), use_container_width=True)
+                st.caption(" · ".join(
+                    f"{row['Tahap']}: {row['Waktu (dtk)']:.2f} dtk" for _, row in stages_df.iterrows()
+                ))
 
                 # Export ke Excel dengan format persen
                 excel_buffer = io.BytesIO()
                 with pd.ExcelWriter(excel_buffer, engine='xlsxwriter') as writer:
                     metrics_df.to_excel(writer, index=False, sheet_name='Performa Model')
+                    stages_df.to_excel(writer, index=False, sheet_name='Telemetri Tahap')
                     workbook = writer.book
                     worksheet = writer.sheets['Performa Model']
                     percent_fmt = workbook.add_format({'num_format': '0.00%'})
+                    density_fmt = workbook.add_format({'num_format': '0.0000%'})
+                    number_fmt = workbook.add_format({'num_format': '0.00'})
                     for col_idx, col_name in enumerate(metrics_df.columns):
                         if col_name in col_list:
                             worksheet.set_column(col_idx, col_idx, 12, percent_fmt)
+                        elif col_name == 'Kepadatan':
+                            worksheet.set_column(col_idx, col_idx, 12, density_fmt)
+                        elif col_name in telemetry_columns({}):
+                            worksheet.set_column(col_idx, col_idx, 14, number_fmt)
 
                 st.download_button(
                     label="📅 Unduh Tabel Performa Model (Excel)",
@@ -190,15 +708,12 @@ def show():
             with col2:
                 st.subheader("☁️ WordCloud Keseluruhan")
                 try:
-                    wordcloud = WordCloud(width=800, height=400, background_color='white').generate(' '.join(data['Komentar']))
-                    fig_wc, ax_wc = plt.subplots(figsize=(10, 5))
-                    ax_wc.imshow(wordcloud, interpolation='bilinear')
-                    ax_wc.axis("off")
-                    st.pyplot(fig_wc, use_container_width=True)
+                    png = charts["all"].result()
+                    st.image(png, use_container_width=True)
 
                     st.download_button(
                         "📅 Unduh WordCloud",
-                        data=fig_to_bytes(fig_wc),
+                        data=png,
                         file_name="wordcloud_utama.png",
                         mime="image/png",
                         use_container_width=True
@@ -206,31 +721,29 @@ def show():
                 except Exception as e:
                     st.error(f"❌ Gagal membuat WordCloud: {e}")
 
+            with st.expander("📈 Riwayat Run"):
+                show_history()
+
+            show_registry_form(
+                {name: results[name] for name in model_names if name in results}, features["vectorizer"], data_key,
+                model_params=model_params,
+            )
+
+            st.markdown("---")
+            show_tuning(features, features_key, budget, model_params)
+
             st.markdown("---")
             col3, col4 = st.columns(2)
 
             with col3:
                 st.subheader("📊 Grafik Perbandingan Akurasi Model")
                 try:
-                    metrics_df_plot = metrics_df.copy()
-                    metrics_df_plot['Akurasi'] = metrics_df_plot['Akurasi'] * 100
-                    fig_bar, ax = plt.subplots(figsize=(10, 5))
-                    sns.barplot(x='Model', y='Akurasi', data=metrics_df_plot, ax=ax, palette='coolwarm', hue='Model', legend=False)
-                    ax.set_ylim(0, 100)
-                    ax.set_ylabel("Akurasi (%)")
-
-                    for p in ax.patches:
-                        ax.annotate(
-                            f"{p.get_height():.1f}%", 
-                            (p.get_x() + p.get_width() / 2., p.get_height()),
-                            ha='center', va='bottom', fontsize=9, color='black'
-                        )
-
-                    st.pyplot(fig_bar, use_container_width=True)
+                    png = charts["accuracy"].result()
+                    st.image(png, use_container_width=True)
 
                     st.download_button(
                         "📅 Unduh Grafik Model",
-                        data=fig_to_bytes(fig_bar),
+                        data=png,
                         file_name="perbandingan_model.png",
                         mime="image/png",
                         use_container_width=True
@@ -241,15 +754,12 @@ def show():
             with col4:
                 st.subheader("📊 Distribusi Sentimen")
                 try:
-                    sentiment_counts = data['Label'].value_counts()
-                    fig_pie, ax_pie = plt.subplots(figsize=(6, 3))
-                    ax_pie.pie(sentiment_counts, labels=sentiment_counts.index, autopct='%1.1f%%', startangle=140, wedgeprops={'edgecolor': 'black'})
-                    ax_pie.axis('equal')
-                    st.pyplot(fig_pie, use_container_width=True)
+                    png = charts["distribution"].result()
+                    st.image(png, use_container_width=True)
 
                     st.download_button(
                         "📅 Unduh Distribusi Sentimen",
-                        data=fig_to_bytes(fig_pie),
+                        data=png,
                         file_name="distribusi_sentimen.png",
                         mime="image/png",
                         use_container_width=True
@@ -261,29 +771,25 @@ def show():
             st.subheader("📌 WordCloud Berdasarkan Sentimen")
             col_pos, col_neg, col_neu = st.columns(3)
 
-            def safe_wordcloud(label, color):
+            def safe_wordcloud(label):
                 try:
-                    text = ' '.join(data[data['Label'].str.lower() == label]['Komentar'].dropna())
-                    wc = WordCloud(width=400, height=300, background_color='white', colormap=color).generate(text)
-                    fig, ax = plt.subplots()
-                    ax.imshow(wc, interpolation='bilinear')
-                    ax.axis("off")
-                    st.pyplot(fig, use_container_width=True)
-                    st.download_button(f"📅 Unduh WordCloud {label.capitalize()}", data=fig_to_bytes(fig), file_name=f"wordcloud_{label}.png", mime="image/png", use_container_width=True)
+                    png = charts[label].result()
+                    st.image(png, use_container_width=True)
+                    st.download_button(f"📅 Unduh WordCloud {label.capitalize()}", data=png, file_name=f"wordcloud_{label}.png", mime="image/png", use_container_width=True)
                 except Exception as e:
                     st.warning(f"⚠️ WordCloud untuk '{label}' gagal: {e}")
 
             with col_pos:
                 st.markdown("✅ **Positif**")
-                safe_wordcloud("positif", "Greens")
+                safe_wordcloud("positif")
 
             with col_neg:
                 st.markdown("❌ **Negatif**")
-                safe_wordcloud("negatif", "Reds")
+                safe_wordcloud("negatif")
 
             with col_neu:
                 st.markdown("💬 **Netral**")
-                safe_wordcloud("netral", "Blues")
+                safe_wordcloud("netral")
 
 if __name__ == "__main__":
     show()
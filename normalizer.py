@@ -0,0 +1,94 @@
+import re
+from collections import defaultdict
+
+
+def _trie_pattern(keys):
+    # Semua kunci digabung menjadi satu regex berbentuk trie, misalnya
+    # ["bgt", "bln", "br"] -> b(?:gt|ln|r), sehingga pencocokan cukup satu lintasan
+    trie = {}
+    for key in keys:
+        node = trie
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    return _node_pattern(trie)
+
+
+def _node_pattern(node):
+    optional = "" in node
+    branches = []
+    for ch in sorted(k for k in node if k):
+        atom = r"\s+" if ch == " " else re.escape(ch)
+        branches.append(atom + _node_pattern(node[ch]))
+    if not branches:
+        return ""
+    if len(branches) == 1 and not optional:
+        return branches[0]
+    # Quantifier '?' bersifat greedy, jadi kunci terpanjang dicoba lebih dulu
+    return "(?:" + "|".join(branches) + ")" + ("?" if optional else "")
+
+
+class Normalizer:
+    # Tabel singkatan/slang yang dikompilasi. Kunci satu kata dipetakan lewat
+    # dict per token; jika ada kunci frasa (multi-kata), seluruh tabel dikompilasi
+    # menjadi satu regex trie agar frasa dan kata tunggal diganti dalam satu lintasan.
+    def __init__(self, entries):
+        self.mapping = {}
+        origins = defaultdict(list)
+        for key, value, source in entries:
+            key = " ".join(key.lower().split())
+            if not key:
+                continue
+            value = value.strip()
+            origins[key].append((value, source))
+            self.mapping[key] = value
+
+        # Entri yang muncul belakangan tetap menang, konflik hanya dilaporkan
+        self.conflicts = {
+            key: found for key, found in origins.items()
+            if len({" ".join(value.lower().split()) for value, _ in found}) > 1
+        }
+        self.duplicates = {
+            key: found for key, found in origins.items()
+            if len(found) > 1 and key not in self.conflicts
+        }
+
+        self.token_map = {k: tuple(v.lower().split()) for k, v in self.mapping.items() if " " not in k}
+        self.phrases = sorted(k for k in self.mapping if " " in k)
+        self.pattern = None
+        if self.phrases:
+            self._replacements = {k: " ".join(v.lower().split()) for k, v in self.mapping.items()}
+            self.pattern = re.compile(r"(?<!\S)" + _trie_pattern(self.mapping) + r"(?!\S)")
+
+    def _replace(self, match):
+        return self._replacements[" ".join(match.group(0).split())]
+
+    def rewrite(self, text):
+        # Teks masukan sudah huruf kecil dan hanya berisi huruf serta spasi
+        if self.pattern is not None:
+            return self.pattern.sub(self._replace, text)
+        return " ".join(w for token in text.split() for w in self.token_map.get(token, (token,)))
+
+    def rewrite_series(self, texts):
+        if self.pattern is None:
+            return texts.map(self.rewrite)
+        return texts.str.replace(self.pattern, self._replace, regex=True)
+
+    def conflict_report(self):
+        lines = []
+        for key, found in self.conflicts.items():
+            values = ", ".join(f"'{value}' ({source})" for value, source in found)
+            lines.append(f"{key}: {values} -> dipakai '{self.mapping[key]}'")
+        return lines
+
+
+def read_entries(path):
+    # Format file: satu entri 'singkatan:kepanjangan' per baris, '#' untuk komentar
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            key, sep, value = line.partition(":")
+            if sep:
+                yield key, value, f"{path}:{line_no}"
@@ -1,125 +1,195 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import os
 import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import multiprocessing
 from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+import resources
+from stem_cache import StemCache
+from lexicon import LexiconIndex, LABEL_COLUMNS
+from profiling import StageProfiler, stage
+from row_cache import RowCache, hash_texts, namespace as row_cache_namespace
 
 stemmer_factory = StemmerFactory()
 stemmer = stemmer_factory.create_stemmer()
+# Stemmer bawaan Sastrawi menyimpan cache tanpa batas, jadi StemCache memanggil stemmer dasarnya
+stem_cache = StemCache(stemmer.delegatedStemmer.stem)
+row_cache = RowCache()
 
-abbreviation_dict = {
-    # Negasi
-    "tdk": "tidak", "gak": "tidak", "ga": "tidak","gk":"tidak","engga":"tidak", "jgn": "jangan", 
-    "blm": "belum", "bkn": "bukan", "br":"baru","aja":"saja","bcra":"bicara", "gede":"besar"
-    ,"ws":"sudah","sja":"saja","sja":"saja","jwb":"jawab","y":"iya",'nda':"tidak"
-    # Kata ganti
-    ,"sy": "saya", "aku": "aku", "gw": "gue", "lu": "lo", "sdah":"sudah","koq":" ","wes":"sudah"
-    ,"mrk": "mereka", "kmu": "kamu", "kalian": "kalian", "jd":"jadi","gj":"tidak jelas"
-    ,"kami": "kami", "kita": "kita", "doi": "dia","sm":"sama","ni":"ini","lu":"kamu","sdh":"sudah"
-    # Preposisi & konjungsi
-    ,"dr": "dari", "ke": "ke", "di": "di", "pd": "pada", 
-    "utk": "untuk", "dg": "dengan", "krn": "karena", 
-    "klo": "kalau", "kl": "kalau", "kalo": "kalau", 
-    "jika": "jika", "kpd": "kepada", "yg": "yang", 
-    "stlh": "setelah", "sblm": "sebelum","quot":" ",
-    # Kata umum
-    "jg": "juga", "sdh": "sudah", "udh": "sudah", 
-    "udah": "sudah", "dpt": "dapat", "bgt": "banget", 
-    "skrg": "sekarang", "skrng": "sekarang", 
-    "trs": "terus", "trus": "terus", "dlm": "dalam", 
-    "org": "orang", "tgl": "tanggal", "tggl": "tanggal", 
-    "hr": "hari", "bln": "bulan", "thn": "tahun", 
-    "th": "tahun", "sm": "sama", "spt": "seperti", 
-    "kyk": "kayak", "kek": "kayak", "aja": "saja", 
-    "aj": "saja", "doang": "saja",
-    # Pertanyaan
-    "ap": "apa", "knp": "kenapa", "kpn": "kapan", 
-    "gmn": "gimana", "dmna": "dimana", "dmn": "dimana",
-    # Istilah gaul
-    "mantul": "mantap betul", "santuy": "santai", 
-    "gercep": "gerak cepat", "pcr": "pacar", 
-    "bucin": "budak cinta", "gaje": "gak jelas", 
-    "mager": "malas gerak", "tbtb": "tiba-tiba", 
-    "typo": "salah ketik", "kepo": "ingin tahu",
-    "gabut": "gak ada kerjaan", "baper": "bawa perasaan",
-    # Ekspresi
-    "wkwk": " ", "haha": " ", "lol": "", 
-     "duh": "aduh",
-    # Tambahan kata kerja
-    "ngmg": "ngomong", "bcr": "bicara", "mkn": "makan",
-    "mls": "malas", "tdr": "tidur",
-    # Istilah online
-    "cmiiw": "correct me if I'm wrong", 
-    "btw": "by the way", "otw": "on the way",
-    "dll": "dan lain-lain", "dsb": "dan sebagainya",
-    "afk": "away from keyboard", "asap": "as soon as possible"
-}
-
+NON_ALPHA_PATTERN = re.compile(r'[^\x00-\x7F]+|[^a-zA-Z\s]')
+URL_PATTERN = re.compile(r'http\S+|www\S+|https\S+', flags=re.MULTILINE)
 
 
 def replace_abbreviations(text):
-    words = text.lower().split()
-    replaced = [abbreviation_dict.get(word, word) for word in words]
-    return ' '.join(replaced)
+    return resources.load_normalizer().rewrite(text.lower())
+
+
+class TextCleaner:
+    # Pola regex dan set stopword dikompilasi sekali per konfigurasi. Setiap token
+    # unik hanya diproses (singkatan -> stopword -> stemming) satu kali, hasilnya
+    # disimpan di tabel token dan dipakai ulang untuk baris-baris berikutnya.
+    def __init__(self, custom_stopwords=(), apply_stemming=False, custom_stems=None,
+                 auto_stopwords=False, auto_stemming=False, max_tokens=None):
+        # Cache stemming global modul diambil saat cleaner dibuat (benchmark menggantinya
+        # lalu mengosongkan _cached_cleaner agar cleaner baru memakai cache yang dingin)
+        self.stem_cache = stem_cache
+        self.stop_words = resources.load_stopwords().union(custom_stopwords)
+        self.apply_stemming = apply_stemming
+        self.custom_stems = dict(custom_stems or {})
+        self.stemming = bool(auto_stemming or apply_stemming)
+        # Jika tabel memuat frasa, penggantian dilakukan regex trie sebelum tokenisasi
+        # sehingga tabel token tidak perlu mengganti singkatan lagi
+        self.normalizer = resources.load_normalizer()
+        self.phrases = self.normalizer.pattern is not None
+        self.abbreviations = {} if self.phrases else self.normalizer.token_map
+        # max_tokens membatasi tabel token untuk proses berumur panjang (server inference):
+        # jika penuh, tabel dikosongkan dan diisi ulang dari token yang datang berikutnya
+        self.max_tokens = max_tokens
+        self._tokens = {}
+
+    def _make_room(self, incoming):
+        if self.max_tokens is not None and len(self._tokens) + incoming > self.max_tokens:
+            self._tokens.clear()
+
+    def _stem(self, word, stems=None):
+        # Stem manual dari sidebar selalu didahulukan dari hasil cache
+        if self.apply_stemming and word in self.custom_stems:
+            return self.custom_stems[word]
+        if stems is not None:
+            return stems[word]
+        return self.stem_cache.stem(word)
+
+    def _filter(self, token):
+        return [w for w in self.abbreviations.get(token, (token,)) if w not in self.stop_words]
+
+    def _expand(self, token, stems=None):
+        words = self._filter(token)
+        if self.stemming:
+            words = [self._stem(w, stems) for w in words]
+        self._make_room(1)
+        self._tokens[token] = words
+        return words
+
+    def _build_tokens(self, split_texts, profiler=None):
+        # Semua token baru dalam batch diproses per tahap sekaligus
+        with stage(profiler, "tokenisasi") as record:
+            unseen = {token for tokens in split_texts for token in tokens}.difference(self._tokens)
+            record["tokens"] = sum(map(len, split_texts))
+        if not unseen:
+            return
 
-def clean_text(text, custom_stopwords, apply_stemming, custom_stems, auto_stopwords, auto_stemming):
-    try:
+        with stage(profiler, "singkatan") as record:
+            expanded = {token: self.abbreviations.get(token, (token,)) for token in unseen}
+            record["tokens"] = len(expanded)
+
+        with stage(profiler, "stopword") as record:
+            filtered = {token: [w for w in words if w not in self.stop_words] for token, words in expanded.items()}
+            record["tokens"] = sum(map(len, expanded.values()))
+
+        if self.stemming:
+            with stage(profiler, "stemming") as record:
+                words = self._stem_candidates(filtered)
+                stems = self.stem_cache.stem_many(words)
+                self.stem_cache.flush()
+                filtered = {token: [self._stem(w, stems) for w in ws] for token, ws in filtered.items()}
+                record["tokens"] = len(words)
+
+        self._make_room(len(filtered))
+        self._tokens.update(filtered)
+
+    def _stem_candidates(self, filtered):
+        return {
+            w for ws in filtered.values() for w in ws
+            if not (self.apply_stemming and w in self.custom_stems)
+        }
+
+    def stem_vocabulary(self, series):
+        # Kata unik seluruh series yang perlu di-stem, tanpa memanggil stemmer
+        if not self.stemming:
+            return set()
+        _, split_texts = self._split_series(series)
+        tokens = {token for tokens in split_texts for token in tokens}
+        return self._stem_candidates({token: self._filter(token) for token in tokens})
+
+    def _join(self, tokens):
+        table = self._tokens
+        out = []
+        for token in tokens:
+            words = table.get(token)
+            if words is None:
+                words = self._expand(token)
+            out.extend(words)
+        return " ".join(out)
+
+    def _normalize(self, text):
+        text = NON_ALPHA_PATTERN.sub(' ', text)
+        text = URL_PATTERN.sub('', text)
+        # Emoji sudah ikut terhapus oleh filter non-ASCII di atas
+        return text.lower()
+
+    def clean(self, text):
         if not isinstance(text, str):
             return ''
-        
-        text = re.sub(r'[^\x00-\x7F]+', ' ', text)
-        text = re.sub(r'[^a-zA-Z\s]', ' ', text)
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-
-        emoji_pattern = re.compile("[" 
-            u"\U0001F600-\U0001F64F" u"\U0001F300-\U0001F5FF"
-            u"\U0001F680-\U0001F6FF" u"\U0001F1E0-\U0001F1FF"
-            u"\U00002700-\U000027BF" u"\U0001F900-\U0001F9FF"
-            u"\U00002600-\U000026FF" u"\U0000200D"
-            u"\U00002300-\U000023FF" u"\U0001FA70-\U0001FAFF"
-        "]+", flags=re.UNICODE)
-        text = emoji_pattern.sub(r'', text)
-
-        text = replace_abbreviations(text)
-        words = text.lower().split()
-
-        default_stopwords = [
-        'nya', 'ya', 'halo','lah','yaa','dih','apaan', 'coba', 'quot', 'sih', 'nih', 'dong', 'kayak', 'banget',
-        'liat', 'aja', 'gitu', 'ampun', 'makasih', 'terima', 'kasih', 'bang', 'deh', 'di',
-        'dong', 'loh', 'lah', 'nyaa', 'yaa', 'uh', 'wkwk', 'wkwkwk', 'hehe', 'huhu',
-        'hehehe', 'hadeh', 'waduh', 'aduh', 'hmm', 'hmmm', 'eh', 'yaudah', 'nggak',
-        'ngga', 'ga', 'gak', 'kok', 'padahal', 'doang', 'biar', 'malah', 'jangan',
-        'boleh', 'udah', 'sudah', 'baru', 'tuh', 'kan', 'itu', 'ini', 'gini', 'gituan',
-        'nanti', 'besok', 'hari', 'mbak', 'mas', 'bro', 'sis', 'woy', 'oi', 'sob',
-        'agan', 'gan', 'min', 'admin', 'anda', 'saya', 'aku', 'gue', 'elo', 'loe',
-        'lu', 'gua', 'kamu', 'dia', 'kalian', 'mereka', 'kita', 'kami', 'pun', 'toh',
-        'lagi', 'terus', 'terusnya', 'terlalu', 'sama', 'yang', 'seperti', 'daripada',
-        'atau', 'dan', 'tapi', 'kalau', 'jadi', 'dari', 'buat', 'untuk', 'agar',
-        'karena', 'sebab', 'oleh', 'dengan', 'tanpa', 'tentang', 'meskipun', 'namun',
-        'bahkan', 'misalnya', 'contohnya', 'dll', 'dst', 'dsb', 'etc', 'ok', 'oke',
-        'okay', 'sip', 'mantap', 'nice', 'thanks', 'thank', 'thankyou', 'btw', 'imo',
-        'idk', 'cmiiw', 'wfm', 'yoi', 'yuk', 'ayo', 'nah', 'ngapain', 'siapa',
-        'dimana', 'kapan', 'kenapa', 'bagaimana', 'hahaha', 'hahahaha', 'lmao', 'lol',
-        'wtf', 'astaga', 'astagfirullah', 'inshaallah', 'insyaallah', 'alhamdulillah',
-        'masyaallah', 'subhanallah',
-        # Kata netral
-        'orang', 'presiden', 'prabowo', 'manusia', 'pacar', 'anak', 'laki', 'wanita',
-        'hidup', 'tanggung', 'hukum', 'korban', 'bayar', 'tv', 'jeep', 'pinggir',
-        # Sosial media umum
-        'komen', 'video', 'judul', 'konten', 'caption', 'story', 'stream', 'live',
-        'nonton', 'like', 'subscribe', 'share', 'streamer'
-    ]
-
-        stop_words = set(default_stopwords + custom_stopwords)
-        words = [w for w in words if w not in stop_words]
-
-        if auto_stemming or apply_stemming:
-            if apply_stemming:
-                words = [custom_stems.get(w, stemmer.stem(w)) for w in words]
-            else:
-                words = [stemmer.stem(w) for w in words]
-
-        return " ".join(words)
+        text = self._normalize(text)
+        if self.phrases:
+            text = self.normalizer.rewrite(text)
+        return self._join(text.split())
+
+    def normalize_series(self, texts):
+        return (
+            texts.astype(object)
+            .str.replace(NON_ALPHA_PATTERN, ' ', regex=True)
+            .str.replace(URL_PATTERN, '', regex=True)
+            .str.lower()
+        )
+
+    def _split_series(self, series, profiler=None):
+        is_text = series.map(lambda x: isinstance(x, str))
+        with stage(profiler, "regex & lowercase"):
+            texts = self.normalize_series(series[is_text])
+        if self.phrases:
+            with stage(profiler, "frasa slang") as record:
+                texts = self.normalizer.rewrite_series(texts)
+                record["tokens"] = len(texts)
+        with stage(profiler, "regex & lowercase"):
+            split_texts = [text.split() for text in texts]
+        return is_text, split_texts
+
+    def clean_series(self, series, profiler=None):
+        is_text, split_texts = self._split_series(series, profiler)
+        self._build_tokens(split_texts, profiler)
+        with stage(profiler, "gabung token"):
+            result = pd.Series('', index=series.index, dtype=object)
+            result[is_text] = [self._join(tokens) for tokens in split_texts]
+        return result
+
+
+def _cleaner_key(custom_stopwords, apply_stemming, custom_stems, auto_stopwords, auto_stemming):
+    # Versi file kamus ikut menjadi kunci agar perubahan file langsung terpakai
+    return (
+        tuple(custom_stopwords), bool(apply_stemming), tuple(sorted((custom_stems or {}).items())),
+        bool(auto_stopwords), bool(auto_stemming),
+        resources.version((*resources.normalizer_paths(), resources.STOPWORDS_PATH))
+    )
+
+
+@lru_cache(maxsize=8)
+def _cached_cleaner(custom_stopwords, apply_stemming, custom_stems, auto_stopwords, auto_stemming, resource_version):
+    return TextCleaner(custom_stopwords, apply_stemming, dict(custom_stems), auto_stopwords, auto_stemming)
+
+
+def get_cleaner(custom_stopwords, apply_stemming, custom_stems, auto_stopwords, auto_stemming):
+    return _cached_cleaner(*_cleaner_key(custom_stopwords, apply_stemming, custom_stems, auto_stopwords, auto_stemming))
 
+
+def clean_text(text, custom_stopwords, apply_stemming, custom_stems, auto_stopwords, auto_stemming):
+    try:
+        cleaner = get_cleaner(custom_stopwords, apply_stemming, custom_stems, auto_stopwords, auto_stemming)
+        return cleaner.clean(text)
     except Exception as e:
         st.warning(f"⚠️ Gagal membersihkan teks: {e}")
         return ""
@@ -148,10 +218,153 @@ def apply_label(text, positive_words, negative_words, threshold=0.1, prefer_domi
         st.warning(f"⚠️ Gagal menentukan label: {e}")
         return "Netral"
 
+PARALLEL_MIN_ROWS = 20_000
+DEFAULT_CHUNK_SIZE = 10_000
+STREAM_CHUNK_SIZE = 50_000
+# Minimal kata per potongan stemming paralel; kosakata lebih kecil di-stem langsung
+STEM_SLICE_SIZE = 200
+
+
+def _preprocess_chunk(texts, cleaner_args, lexicon, profile=False):
+    profiler = StageProfiler() if profile else None
+    cleaned = get_cleaner(*cleaner_args).clean_series(texts, profiler)
+    labels = None
+    if lexicon is not None:
+        with stage(profiler, "labeling"):
+            labels = lexicon.label_series(cleaned)
+    stem_cache.flush()
+    return cleaned, labels, profiler
+
+
+# Argumen bersama worker, dikirim sekali per proses lewat initializer
+_worker_args = None
+
+
+def _init_worker(cleaner_args, lexicon, stems, profile):
+    global _worker_args
+    # Tabel stem hasil proses induk: worker tidak perlu memanggil Sastrawi lagi
+    stem_cache.store_many(stems, persist=False)
+    _worker_args = (cleaner_args, lexicon, profile)
+
+
+def _preprocess_worker_chunk(texts):
+    return _preprocess_chunk(texts, *_worker_args)
+
+
+def _stem_words(words):
+    return {word: stem_cache.stem_func(word) for word in words}
+
+
+def _shared_stems(texts, cleaner_args, workers, context, profiler=None):
+    # Kosakata seluruh data di-stem sekali: kata yang belum ada di cache
+    # dibagi ke worker dalam potongan disjoint, lalu hasilnya disimpan ke cache
+    with stage(profiler, "kosakata") as record:
+        words = get_cleaner(*cleaner_args).stem_vocabulary(texts)
+        record["tokens"] = len(words)
+    if not words:
+        return {}
+    stems = stem_cache.lookup_many(words)
+    missing = sorted(words.difference(stems))
+    if not missing:
+        return stems
+    with stage(profiler, "stemming") as record:
+        if len(missing) < STEM_SLICE_SIZE:
+            stems.update(stem_cache.stem_many(missing))
+        else:
+            size = max(STEM_SLICE_SIZE, -(-len(missing) // (4 * workers)))
+            slices = [missing[i:i + size] for i in range(0, len(missing), size)]
+            with ProcessPoolExecutor(max_workers=min(workers, len(slices)), mp_context=context) as executor:
+                for part in executor.map(_stem_words, slices):
+                    stem_cache.store_many(part)
+                    stems.update(part)
+                    stem_cache.misses += len(part)
+        record["tokens"] = len(missing)
+    stem_cache.flush()
+    return stems
+
+
+def _run_uncached(texts, cleaner_args, lexicon, workers, chunk_size, profiler=None):
+    # Mode paralel hanya dipakai jika data cukup besar untuk menutup biaya start proses
+    workers = max(1, int(workers))
+    chunk_size = max(1, int(chunk_size))
+    if workers == 1 or len(texts) < max(PARALLEL_MIN_ROWS, 2 * chunk_size):
+        cleaned, labels, chunk_profiler = _preprocess_chunk(texts, cleaner_args, lexicon, profiler is not None)
+        if profiler is not None:
+            profiler.merge(chunk_profiler)
+        return cleaned, labels, False
+
+    chunks = [texts.iloc[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    workers = min(workers, len(chunks))
+    context = multiprocessing.get_context("spawn")
+    stems = _shared_stems(texts, cleaner_args, workers, context, profiler)
+    initargs = (cleaner_args, lexicon, stems, profiler is not None)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=initargs) as executor:
+        # executor.map mengembalikan hasil sesuai urutan chunk
+        results = list(executor.map(_preprocess_worker_chunk, chunks))
+
+    if profiler is not None:
+        # Waktu dari worker dijumlahkan, sehingga total bisa melebihi waktu dinding
+        for r in results:
+            profiler.merge(r[2])
+    cleaned = pd.concat([r[0] for r in results])
+    labels = pd.concat([r[1] for r in results]) if lexicon is not None else None
+    return cleaned, labels, True
+
+
+def run_preprocessing(texts, cleaner_args, lexicon=None, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, profiler=None,
+                      use_cache=True):
+    # Hanya baris yang hash (isi komentar + konfigurasi) belum ada di cache yang diproses.
+    # use_cache=False untuk jalur streaming/batch: baris sekali lewat tidak perlu disimpan,
+    # sehingga memori tetap bergantung pada ukuran chunk
+    if not use_cache:
+        cleaned, labels, parallel = _run_uncached(texts, cleaner_args, lexicon, workers, chunk_size, profiler)
+        info = {"parallel": parallel, "cached_rows": 0, "processed_rows": len(texts)}
+        return cleaned, labels, info
+
+    ns = row_cache_namespace(
+        _cleaner_key(*cleaner_args), lexicon.fingerprint if lexicon is not None else None
+    )
+    with stage(profiler, "cache baris"):
+        is_text = texts.map(lambda x: isinstance(x, str)).to_numpy(dtype=bool)
+        text_pos = np.flatnonzero(is_text)
+        row_hash = np.zeros(len(texts), dtype=np.uint64)
+        row_hash[text_pos] = hash_texts(texts.iloc[text_pos])
+        found = row_cache.lookup(ns, row_hash[text_pos])
+
+    rows = [None] * len(texts)
+    for i, value in found.items():
+        rows[text_pos[i]] = value
+    todo_pos = np.array([i for i, row in enumerate(rows) if row is None], dtype=np.int64)
+
+    parallel = False
+    if len(todo_pos):
+        cleaned, labels, parallel = _run_uncached(
+            texts.iloc[todo_pos], cleaner_args, lexicon, workers, chunk_size, profiler
+        )
+        if lexicon is None:
+            new_rows = [(c,) for c in cleaned]
+        else:
+            new_rows = [(c,) + l for c, l in zip(cleaned, labels.itertuples(index=False, name=None))]
+        for pos, row in zip(todo_pos, new_rows):
+            rows[pos] = row
+        with stage(profiler, "cache baris"):
+            store = is_text[todo_pos]
+            row_cache.store(ns, row_hash[todo_pos[store]], [row for row, keep in zip(new_rows, store) if keep])
+
+    with stage(profiler, "susun hasil"):
+        cleaned = pd.Series([row[0] for row in rows], index=texts.index, dtype=object)
+        labels = None
+        if lexicon is not None:
+            labels = pd.DataFrame([row[1:] for row in rows], index=texts.index, columns=LABEL_COLUMNS)
+
+    info = {"parallel": parallel, "cached_rows": len(found), "processed_rows": len(todo_pos)}
+    return cleaned, labels, info
+
+
 def load_words_from_file(path):
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            return [line.strip().lower() for line in f if line.strip()]
+        return list(resources.load_words(path))
     except FileNotFoundError:
         st.warning(f"📁 File tidak ditemukan: {path}")
         return []
@@ -159,11 +372,209 @@ def load_words_from_file(path):
         st.warning(f"⚠️ Gagal memuat file {path}: {e}")
         return []
 
+def sidebar_settings():
+    manual_stop = st.sidebar.checkbox("Stopword Manual")
+    auto_stop = st.sidebar.checkbox("Stopword Otomatis")
+    custom_stop = []
+    if manual_stop:
+        stop_input = st.sidebar.text_area("Stopwords (pisahkan dengan koma)", "")
+        custom_stop = [w.strip().lower() for w in stop_input.split(",") if w.strip()]
+
+    manual_stem = st.sidebar.checkbox("Stemming Manual")
+    auto_stem = st.sidebar.checkbox("Stemming Otomatis")
+    custom_stem = {}
+    if manual_stem:
+        stem_input = st.sidebar.text_area("Custom Stem (kata:stem)", "")
+        if stem_input:
+            try:
+                custom_stem = {i.split(":")[0].strip(): i.split(":")[1].strip() for i in stem_input.split(",") if ":" in i}
+            except Exception as e:
+                st.warning(f"⚠️ Format stem manual salah: {e}")
+
+    st.sidebar.header("📌 Label Sentimen")
+    use_auto_dict = st.sidebar.checkbox("Gunakan Kamus Otomatis")
+    pos_words = []
+    neg_words = []
+
+    if use_auto_dict:
+        pos_words = load_words_from_file(resources.POSITIVE_PATH)
+        neg_words = load_words_from_file(resources.NEGATIVE_PATH)
+
+    manual_label = st.sidebar.checkbox("Label Manual")
+    if manual_label:
+        pos_input = st.sidebar.text_area("Kata-kata Positif (Manual)", "")
+        neg_input = st.sidebar.text_area("Kata-kata Negatif (Manual)", "")
+        pos_words += [w.strip().lower() for w in pos_input.split(",") if w.strip()]
+        neg_words += [w.strip().lower() for w in neg_input.split(",") if w.strip()]
+
+    lexicon = None
+    if use_auto_dict or manual_label:
+        match_phrases = st.sidebar.checkbox("Cocokkan Frasa Multi-kata")
+        lexicon = LexiconIndex(pos_words, neg_words, match_phrases=match_phrases)
+
+    st.sidebar.header("🚀 Mode Paralel")
+    use_parallel = st.sidebar.checkbox("Gunakan Multi-core")
+    workers = 1
+    chunk_size = DEFAULT_CHUNK_SIZE
+    if use_parallel:
+        workers = st.sidebar.number_input("Jumlah Worker", min_value=1, max_value=os.cpu_count() or 1, value=os.cpu_count() or 1)
+        chunk_size = st.sidebar.number_input("Ukuran Chunk (baris)", min_value=1000, value=DEFAULT_CHUNK_SIZE, step=1000)
+
+    profile = st.sidebar.checkbox("⏱️ Tampilkan Profil Waktu per Tahap")
+
+    return {
+        "cleaner_args": (custom_stop, manual_stem, custom_stem, auto_stop, auto_stem),
+        "stemming": bool(manual_stem or auto_stem),
+        "lexicon": lexicon,
+        "use_parallel": use_parallel,
+        "workers": workers,
+        "chunk_size": chunk_size,
+        "profile": profile,
+    }
+
+
+def find_text_column(df):
+    for col in df.columns:
+        if pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col]):
+            return col
+    return None
+
+
+def show_profile(profiler):
+    st.subheader("⏱️ Profil Waktu Preprocessing")
+    st.dataframe(profiler.to_frame().style.format({
+        'Waktu (detik)': '{:.3f}',
+        'Token': '{:,}',
+        'Porsi Waktu': '{:.1%}'
+    }), use_container_width=True)
+    st.download_button(
+        label="📥 Unduh Profil Waktu (JSON)",
+        data=profiler.to_json(),
+        file_name="profil_preprocessing.json",
+        mime="application/json"
+    )
+
+
+def preprocess_csv_stream(source, output_path, settings, chunk_size=STREAM_CHUNK_SIZE, progress=None, profiler=None):
+    # Baca, bersihkan, dan tulis CSV per chunk sehingga memori puncak bergantung pada chunk_size
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return preprocess_csv_stream(f, output_path, settings, chunk_size, progress, profiler)
+
+    total_bytes = _source_size(source)
+    text_col = None
+    rows_in = rows_out = 0
+    with open(output_path, "w", encoding="utf-8", newline="") as out:
+        for i, chunk in enumerate(pd.read_csv(source, chunksize=chunk_size)):
+            if text_col is None:
+                text_col = find_text_column(chunk)
+                if text_col is None:
+                    raise ValueError("Tidak ditemukan kolom teks dalam dataset.")
+            cleaned, labels, _ = run_preprocessing(
+                chunk[text_col], settings["cleaner_args"], settings["lexicon"],
+                settings["workers"], settings["chunk_size"], profiler, use_cache=False
+            )
+            chunk[text_col] = cleaned
+            if labels is not None:
+                chunk[LABEL_COLUMNS] = labels
+            rows_in += len(chunk)
+            chunk = chunk[chunk[text_col].str.strip() != ""].dropna()
+            rows_out += len(chunk)
+            chunk.to_csv(out, header=(i == 0), index=False)
+            if progress is not None:
+                fraction = min(source.tell() / total_bytes, 1.0) if total_bytes else None
+                progress(i + 1, rows_in, rows_out, fraction)
+    return text_col, rows_in, rows_out
+
+
+def _source_size(source):
+    size = getattr(source, "size", None)
+    if size is None:
+        try:
+            size = os.fstat(source.fileno()).st_size
+        except (AttributeError, OSError):
+            return None
+    return size
+
+
+def show_streaming(uploaded_file):
+    st.subheader("📊 Pratinjau Dataset (Mode Streaming)")
+    try:
+        st.dataframe(pd.read_csv(uploaded_file, nrows=100), use_container_width=True)
+        uploaded_file.seek(0)
+    except Exception as e:
+        st.error(f"❌ Gagal membaca file CSV: {e}")
+        return
+
+    st.sidebar.header("⚙️ Pengaturan Preprocessing")
+    stream_chunk = st.sidebar.number_input("Baris per Chunk Streaming", min_value=1000, value=STREAM_CHUNK_SIZE, step=1000)
+    settings = sidebar_settings()
+
+    if st.sidebar.button("🔧 Jalankan Preprocessing"):
+        old_path = st.session_state.get("stream_output")
+        if old_path and os.path.exists(old_path):
+            os.remove(old_path)
+        with tempfile.NamedTemporaryFile(prefix="sentilab_", suffix=".csv", delete=False) as tmp:
+            output_path = tmp.name
+        st.session_state.stream_output = output_path
+
+        bar = st.progress(0.0, text="Memulai preprocessing...")
+
+        def report(chunk_no, rows_in, rows_out, fraction):
+            text = f"Chunk {chunk_no}: {rows_in:,} baris dibaca, {rows_out:,} baris ditulis"
+            bar.progress(fraction if fraction is not None else 0.0, text=text)
+
+        profiler = StageProfiler() if settings["profile"] else None
+        try:
+            uploaded_file.seek(0)
+            text_col, rows_in, rows_out = preprocess_csv_stream(
+                uploaded_file, output_path, settings, int(stream_chunk), report, profiler
+            )
+            bar.progress(1.0, text=f"Selesai: {rows_out:,} dari {rows_in:,} baris disimpan.")
+            if settings["lexicon"] is not None:
+                st.info("Labeling sentimen selesai.")
+        except Exception as e:
+            st.error(f"❌ Terjadi kesalahan saat preprocessing: {e}")
+            return
+        if profiler is not None:
+            show_profile(profiler)
+
+    output_path = st.session_state.get("stream_output")
+    if output_path and os.path.exists(output_path):
+        st.subheader("✅ Dataset Setelah Preprocessing & Labeling")
+        st.dataframe(pd.read_csv(output_path, nrows=100), use_container_width=True)
+        with open(output_path, "rb") as f:
+            st.download_button(
+                label="💾 Unduh Dataset",
+                data=f,
+                file_name="processed_data.csv",
+                mime="text/csv"
+            )
+
+
+def show_normalizer_conflicts():
+    try:
+        normalizer = resources.load_normalizer()
+    except Exception as e:
+        st.warning(f"⚠️ Gagal memuat tabel singkatan: {e}")
+        return
+    conflicts = normalizer.conflict_report()
+    if conflicts:
+        st.warning(f"⚠️ {len(conflicts)} singkatan memiliki kepanjangan berbeda di file kamus (entri terakhir dipakai).")
+        with st.expander("Lihat konflik singkatan"):
+            st.code("\n".join(conflicts))
+
+
 def show():
     st.title("✨ Preprocessing Data untuk Analisis Sentimen")
+    show_normalizer_conflicts()
 
     uploaded_file = st.file_uploader("📂 Unggah Dataset (CSV)", type=["csv"])
     if uploaded_file is not None:
+        if st.sidebar.checkbox("Mode Streaming (file besar)"):
+            show_streaming(uploaded_file)
+            return
+
         try:
             df = pd.read_csv(uploaded_file)
         except Exception as e:
@@ -191,57 +602,40 @@ def show():
         except Exception as e:
             st.warning(f"⚠️ Gagal memodifikasi kolom: {e}")
 
-        manual_stop = st.sidebar.checkbox("Stopword Manual")
-        auto_stop = st.sidebar.checkbox("Stopword Otomatis")
-        custom_stop = []
-        if manual_stop:
-            stop_input = st.sidebar.text_area("Stopwords (pisahkan dengan koma)", "")
-            custom_stop = [w.strip().lower() for w in stop_input.split(",") if w.strip()]
-
-        manual_stem = st.sidebar.checkbox("Stemming Manual")
-        auto_stem = st.sidebar.checkbox("Stemming Otomatis")
-        custom_stem = {}
-        if manual_stem:
-            stem_input = st.sidebar.text_area("Custom Stem (kata:stem)", "")
-            if stem_input:
-                try:
-                    custom_stem = {i.split(":")[0].strip(): i.split(":")[1].strip() for i in stem_input.split(",") if ":" in i}
-                except Exception as e:
-                    st.warning(f"⚠️ Format stem manual salah: {e}")
-
-        st.sidebar.header("📌 Label Sentimen")
-        use_auto_dict = st.sidebar.checkbox("Gunakan Kamus Otomatis")
-        pos_words = []
-        neg_words = []
-
-        if use_auto_dict:
-            pos_words = load_words_from_file("assets/positive.txt")
-            neg_words = load_words_from_file("assets/negative.txt")
-
-        manual_label = st.sidebar.checkbox("Label Manual")
-        if manual_label:
-            pos_input = st.sidebar.text_area("Kata-kata Positif (Manual)", "")
-            neg_input = st.sidebar.text_area("Kata-kata Negatif (Manual)", "")
-            pos_words += [w.strip().lower() for w in pos_input.split(",") if w.strip()]
-            neg_words += [w.strip().lower() for w in neg_input.split(",") if w.strip()]
+        settings = sidebar_settings()
 
         if st.sidebar.button("🔧 Jalankan Preprocessing"):
             try:
-                text_col = None
-                for col in st.session_state.df.columns:
-                    if st.session_state.df[col].dtype == 'object':
-                        text_col = col
-                        break
+                text_col = find_text_column(st.session_state.df)
 
                 if text_col:
-                    st.session_state.df[text_col] = st.session_state.df[text_col].apply(
-                        lambda x: clean_text(x, custom_stop, manual_stem, custom_stem, auto_stop, auto_stem)
+                    profiler = StageProfiler() if settings["profile"] else None
+                    # Statistik cache stemming dihitung per run, bukan sepanjang umur proses
+                    stem_cache.reset_stats()
+                    cleaned, labels, info = run_preprocessing(
+                        st.session_state.df[text_col], settings["cleaner_args"], settings["lexicon"],
+                        settings["workers"], settings["chunk_size"], profiler
                     )
-
-                    if use_auto_dict or manual_label:
-                        st.session_state.df["Label"] = st.session_state.df[text_col].apply(
-                            lambda x: apply_label(x, pos_words, neg_words)
+                    st.session_state.df[text_col] = cleaned
+                    st.caption(
+                        f"♻️ {info['cached_rows']:,} baris diambil dari cache, "
+                        f"{info['processed_rows']:,} baris diproses."
+                    )
+                    if settings["use_parallel"]:
+                        if info["parallel"]:
+                            st.caption(f"🚀 Preprocessing paralel dengan {settings['workers']} worker.")
+                        else:
+                            st.caption("🚀 Data terlalu kecil untuk mode paralel, diproses secara serial.")
+
+                    stats = stem_cache.stats()
+                    if settings["stemming"] and not info["parallel"] and stats["hits"] + stats["disk_hits"] + stats["misses"]:
+                        st.caption(
+                            f"🗂️ Cache stemming: hit rate {stats['hit_rate']:.1%} "
+                            f"(memori {stats['hits']}, disk {stats['disk_hits']}, baru {stats['misses']})"
                         )
+
+                    if labels is not None:
+                        st.session_state.df[LABEL_COLUMNS] = labels
                         st.info("Labeling sentimen selesai.")
 
                     st.session_state.df = st.session_state.df[st.session_state.df[text_col].str.strip() != ""]
@@ -256,6 +650,9 @@ def show():
                         file_name="processed_data.csv",
                         mime="text/csv"
                     )
+
+                    if profiler is not None:
+                        show_profile(profiler)
                 else:
                     st.error("❌ Tidak ditemukan kolom teks dalam dataset.")
             except Exception as e:
@@ -0,0 +1,63 @@
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+import pandas as pd
+
+
+class StageProfiler:
+    # Mengumpulkan waktu kumulatif, jumlah panggilan, dan jumlah token per tahap
+    # preprocessing. Diukur per batch, bukan per token, agar overhead tetap kecil.
+    def __init__(self):
+        self.stages = {}
+
+    def add(self, stage, seconds, calls=1, tokens=0):
+        record = self.stages.setdefault(stage, {"seconds": 0.0, "calls": 0, "tokens": 0})
+        record["seconds"] += seconds
+        record["calls"] += calls
+        record["tokens"] += tokens
+
+    def merge(self, other):
+        for stage, record in other.stages.items():
+            self.add(stage, record["seconds"], record["calls"], record["tokens"])
+
+    @contextmanager
+    def measure(self, stage):
+        record = {"tokens": 0}
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            self.add(stage, time.perf_counter() - start, tokens=record["tokens"])
+
+    def total_seconds(self):
+        return sum(r["seconds"] for r in self.stages.values())
+
+    def to_dict(self):
+        return {"total_seconds": self.total_seconds(), "stages": self.stages}
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_frame(self):
+        total = self.total_seconds() or 1.0
+        return pd.DataFrame([
+            {
+                "Tahap": stage,
+                "Waktu (detik)": r["seconds"],
+                "Panggilan": r["calls"],
+                "Token": r["tokens"],
+                "Porsi Waktu": r["seconds"] / total,
+            }
+            for stage, r in self.stages.items()
+        ])
+
+
+_DISABLED = nullcontext({"tokens": 0})
+
+
+def stage(profiler, name):
+    # Jika profiler tidak aktif, kembalikan context kosong tanpa pengukuran waktu
+    if profiler is None:
+        return _DISABLED
+    return profiler.measure(name)
@@ -0,0 +1,96 @@
+import glob
+import os
+import threading
+
+from normalizer import Normalizer, read_entries
+
+POSITIVE_PATH = "assets/positive.txt"
+NEGATIVE_PATH = "assets/negative.txt"
+ABBREVIATIONS_PATH = "assets/abbreviations.txt"
+STOPWORDS_PATH = "assets/stopwords.txt"
+# File tambahan 'singkatan:kepanjangan' (boleh berisi frasa) dimuat setelah
+# ABBREVIATIONS_PATH sesuai urutan nama file, sehingga entrinya menimpa tabel dasar
+SLANG_DIR = "assets/slang"
+
+# Cache tingkat proses: dipakai bersama oleh semua sesi pengguna dan hanya
+# dimuat ulang jika mtime file berubah, sehingga file kamus bisa diganti
+# tanpa me-restart server.
+_cache = {}
+_lock = threading.Lock()
+
+
+def _load(path, parser):
+    mtime = os.stat(path).st_mtime_ns
+    key = (path, parser.__name__)
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+    value = parser(path)
+    with _lock:
+        _cache[key] = (mtime, value)
+    return value
+
+
+def _read_lines(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+def _parse_words(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return frozenset(line.strip().lower() for line in f if line.strip())
+
+
+def _parse_stopwords(path):
+    return frozenset(line.lower() for line in _read_lines(path))
+
+
+def load_words(path):
+    return _load(path, _parse_words)
+
+
+def load_stopwords(path=STOPWORDS_PATH):
+    return _load(path, _parse_stopwords)
+
+
+def normalizer_paths():
+    return [ABBREVIATIONS_PATH] + sorted(glob.glob(os.path.join(SLANG_DIR, "*.txt")))
+
+
+def load_normalizer(paths=None):
+    # Kunci cache memuat mtime semua file, jadi menambah/mengubah file tambahan
+    # langsung memicu kompilasi ulang
+    paths = tuple(paths or normalizer_paths())
+    stamp = version(paths)
+    key = (paths, "normalizer")
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+    value = Normalizer(entry for path in paths for entry in read_entries(path))
+    with _lock:
+        _cache[key] = (stamp, value)
+    return value
+
+
+def load_abbreviations():
+    return load_normalizer().mapping
+
+
+def load_abbreviation_tokens():
+    return load_normalizer().token_map
+
+
+def version(paths=(ABBREVIATIONS_PATH, STOPWORDS_PATH, POSITIVE_PATH, NEGATIVE_PATH)):
+    # Sidik versi sumber daya, dipakai sebagai bagian kunci cache hasil preprocessing
+    stamps = []
+    for path in paths:
+        try:
+            stamps.append((path, os.stat(path).st_mtime_ns))
+        except OSError:
+            stamps.append((path, None))
+    return tuple(stamps)
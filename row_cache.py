@@ -0,0 +1,71 @@
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+DEFAULT_MAX_BYTES = 256 * 1024 ** 2
+# Perkiraan overhead per entri: node OrderedDict, tuple kunci + int hash, tuple baris dan ukurannya
+ENTRY_OVERHEAD = 300
+
+
+def namespace(*parts):
+    # Sidik konfigurasi preprocessing (stopword, mode stem, stem manual, versi kamus)
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def hash_texts(texts):
+    return pd.util.hash_pandas_object(texts.astype(object), index=False, categorize=False).to_numpy()
+
+
+def row_bytes(row):
+    return ENTRY_OVERHEAD + sum(sys.getsizeof(value) for value in row)
+
+
+class RowCache:
+    # Cache hasil preprocessing per baris dengan kunci (konfigurasi, hash isi komentar).
+    # Baris yang sama dengan konfigurasi yang sama tidak perlu diproses ulang. Baris
+    # paling lama tidak dipakai dibuang jika perkiraan total ukuran melebihi max_bytes.
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._rows = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, ns, hashes):
+        found = {}
+        with self._lock:
+            for i, h in enumerate(hashes):
+                key = (ns, int(h))
+                entry = self._rows.get(key)
+                if entry is not None:
+                    self._rows.move_to_end(key)
+                    found[i] = entry[0]
+        return found
+
+    def store(self, ns, hashes, values):
+        with self._lock:
+            for h, value in zip(hashes, values):
+                key = (ns, int(h))
+                old = self._rows.pop(key, None)
+                if old is not None:
+                    self._bytes -= old[1]
+                nbytes = row_bytes(value)
+                self._rows[key] = (value, nbytes)
+                self._bytes += nbytes
+            while self._rows and self._bytes > self.max_bytes:
+                _, (_, nbytes) = self._rows.popitem(last=False)
+                self._bytes -= nbytes
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
+            self._bytes = 0
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._rows)
@@ -1,11 +1,14 @@
 import streamlit as st
 import pandas as pd
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
 from io import BytesIO
 from google_play_scraper import reviews
 import tweepy
 
+from youtube_fetcher import COLUMNS, DEFAULT_MAX_WORKERS, YouTubeFetcher, parse_video_ids
+
+# Interval pembaruan tabel sementara saat komentar YouTube berdatangan
+STREAM_UPDATE_ROWS = 500
+
 def add_custom_css():
     st.markdown("""
         <style>
@@ -97,52 +100,36 @@ def scrape_twitter_v2(bearer_token, query, count=10):
         st.error(f"❌ Gagal mengambil data dari Twitter. Detail: {str(e)}")
         return []
 
-def video_comments(api_key, video_id):
-    replies = []
+def scrape_youtube(api_key, video_ids, max_workers=DEFAULT_MAX_WORKERS, full_replies=True):
+    # Komentar banyak video diambil paralel; tabel diperbarui bertahap selama baris berdatangan
+    fetcher = YouTubeFetcher(api_key, max_workers=max_workers, full_replies=full_replies)
+    errors, counts, comments = {}, {}, []
+    status = st.empty()
+    preview = st.empty()
     try:
-        youtube = build('youtube', 'v3', developerKey=api_key)
-        video_response = youtube.commentThreads().list(part='snippet,replies', videoId=video_id).execute()
-
-        while video_response:
-            for item in video_response.get('items', []):
-                try:
-                    comment_info = item['snippet']['topLevelComment']['snippet']
-                    replies.append({
-                        "Tanggal": comment_info['publishedAt'],
-                        "User": comment_info['authorDisplayName'],
-                        "Komentar": comment_info['textDisplay'],
-                        "Likes": comment_info['likeCount']
-                    })
-
-                    for reply in item.get('replies', {}).get('comments', []):
-                        reply_info = reply['snippet']
-                        replies.append({
-                            "Tanggal": reply_info['publishedAt'],
-                            "User": reply_info['authorDisplayName'],
-                            "Komentar": reply_info['textDisplay'],
-                            "Likes": reply_info['likeCount']
-                        })
-                except KeyError:
-                    continue
-
-            if 'nextPageToken' in video_response:
-                video_response = youtube.commentThreads().list(
-                    part='snippet,replies',
-                    pageToken=video_response['nextPageToken'],
-                    videoId=video_id
-                ).execute()
-            else:
-                break
-    except HttpError as e:
-        st.error("❌ Gagal mengambil komentar YouTube. Periksa API Key atau ID video.")
-        return []
+        for row in fetcher.iter_comments(video_ids, errors, counts):
+            comments.append(row)
+            if len(comments) % STREAM_UPDATE_ROWS == 0:
+                status.info(f"⏳ {len(comments):,} komentar diterima dari {len(video_ids)} video...")
+                preview.dataframe(pd.DataFrame(comments[-STREAM_UPDATE_ROWS:], columns=COLUMNS))
     except Exception as e:
         st.error(f"❌ Terjadi kesalahan saat mengambil komentar YouTube. Detail: {str(e)}")
         return []
+    finally:
+        status.empty()
+        preview.empty()
 
-    if not replies:
+    if errors and len(errors) == len(video_ids) and not comments:
+        st.error(f"❌ Gagal mengambil komentar YouTube. Periksa API Key atau ID video.\nDetail: {'; '.join(set(errors.values()))}")
+        return []
+    for video_id, message in errors.items():
+        st.warning(f"⚠️ Video {video_id} gagal diambil ({message}); {counts.get(video_id, 0):,} komentar sempat tersimpan.")
+    if not comments:
         st.warning("⚠️ Tidak ada komentar ditemukan atau video tidak memiliki komentar publik.")
-    return replies
+    return comments
+
+def video_comments(api_key, video_id):
+    return scrape_youtube(api_key, [video_id])
 
 def show():
     add_custom_css()
@@ -170,14 +157,19 @@ def show():
     if platform == 'youtube':
         st.subheader("🎥 Scraping Komentar YouTube")
         api_key = st.text_input("🔑 API Key YouTube:")
-        video_id = st.text_input("🔗 Video ID YouTube:")
+        video_text = st.text_area("🔗 Video ID / URL YouTube (satu per baris atau dipisah koma):")
+        col_a, col_b = st.columns(2)
+        with col_a:
+            max_workers = st.number_input("Request Paralel", min_value=1, max_value=32, value=DEFAULT_MAX_WORKERS, step=1)
+        with col_b:
+            full_replies = st.checkbox("Ambil semua balasan", value=True,
+                                       help="Utas balasan yang terpotong di respons commentThreads diambil lengkap")
         if st.button("Scrape Komentar"):
-            if api_key and video_id:
-                comments = video_comments(api_key, video_id)
+            video_ids = parse_video_ids(video_text)
+            if api_key and video_ids:
+                comments = scrape_youtube(api_key, video_ids, int(max_workers), full_replies)
                 if comments:
-                    df = pd.DataFrame(comments)
-                    kolom_urutan = ["Komentar"] + [col for col in df.columns if col != "Komentar"]
-                    df = df[kolom_urutan]
+                    df = pd.DataFrame(comments, columns=COLUMNS)
                     st.session_state.scraped_data = df
                     st.session_state.scraped_columns = df.columns
                 else:
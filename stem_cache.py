@@ -0,0 +1,160 @@
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+DEFAULT_CACHE_PATH = os.path.join("assets", "stem_cache.sqlite")
+DEFAULT_MAX_SIZE = 200_000
+SQLITE_BATCH = 500
+
+
+class StemCache:
+    # Cache hasil stemming dua lapis: LRU di memori (dibatasi max_size) dan
+    # tabel SQLite di disk yang bertahan antar restart server.
+    def __init__(self, stem_func, path=DEFAULT_CACHE_PATH, max_size=DEFAULT_MAX_SIZE):
+        self.stem_func = stem_func
+        self.path = path
+        self.max_size = max_size
+        self._memory = OrderedDict()
+        self._pending = {}
+        self._lock = threading.RLock()
+        self._conn = None
+        self._conn_pid = None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.update(_memory=OrderedDict(), _pending={}, _lock=None, _conn=None, _conn_pid=None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def _connection(self):
+        if self.path is None:
+            return None
+        # Koneksi SQLite tidak boleh dipakai lintas proses
+        if self._conn is None or self._conn_pid != os.getpid():
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+                conn.execute("CREATE TABLE IF NOT EXISTS stems (word TEXT PRIMARY KEY, stem TEXT NOT NULL)")
+                conn.commit()
+            except sqlite3.Error:
+                self.path = None
+                return None
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def _remember(self, word, stem):
+        self._memory[word] = stem
+        self._memory.move_to_end(word)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def _load_from_disk(self, words):
+        conn = self._connection()
+        if conn is None or not words:
+            return {}
+        found = {}
+        words = list(words)
+        for i in range(0, len(words), SQLITE_BATCH):
+            batch = words[i:i + SQLITE_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = conn.execute(f"SELECT word, stem FROM stems WHERE word IN ({placeholders})", batch)
+            found.update(rows.fetchall())
+        return found
+
+    def stem(self, word):
+        stem = self.stem_many([word])[word]
+        if len(self._pending) >= SQLITE_BATCH:
+            self.flush()
+        return stem
+
+    def lookup_many(self, words):
+        # Hanya mencari di memori, antrean dan disk tanpa memanggil stemmer;
+        # kata yang belum pernah di-stem tidak ada di hasil
+        result = {}
+        with self._lock:
+            missing = []
+            for word in set(words):
+                stem = self._memory.get(word)
+                if stem is None:
+                    stem = self._pending.get(word)
+                if stem is None:
+                    missing.append(word)
+                    continue
+                self._remember(word, stem)
+                result[word] = stem
+                self.hits += 1
+            found = self._load_from_disk(missing)
+            for word, stem in found.items():
+                self._remember(word, stem)
+                result[word] = stem
+            self.disk_hits += len(found)
+        return result
+
+    def stem_many(self, words):
+        # Lookup banyak kata sekaligus agar query disk tidak dilakukan per token
+        words = set(words)
+        with self._lock:
+            result = self.lookup_many(words)
+            for word in words.difference(result):
+                stem = self.stem_func(word)
+                self._pending[word] = stem
+                self.misses += 1
+                self._remember(word, stem)
+                result[word] = stem
+        return result
+
+    def store_many(self, stems, persist=True):
+        # Hasil stemming dari proses lain (mis. worker); persist=False hanya mengisi memori
+        with self._lock:
+            for word, stem in stems.items():
+                if persist:
+                    self._pending[word] = stem
+                self._remember(word, stem)
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            conn = self._connection()
+            if conn is not None:
+                try:
+                    conn.executemany("INSERT OR IGNORE INTO stems (word, stem) VALUES (?, ?)", self._pending.items())
+                    conn.commit()
+                except sqlite3.Error:
+                    conn.rollback()
+                    return
+            self._pending.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / total if total else 0.0,
+                "memory_size": len(self._memory),
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.disk_hits = self.misses = 0
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._pending.clear()
+            conn = self._connection()
+            if conn is not None:
+                conn.execute("DELETE FROM stems")
+                conn.commit()
@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+HISTORY_PATH = "run_history.jsonl"
+SAMPLE_INTERVAL = 0.01
+
+_trace_lock = threading.Lock()
+_trace_users = 0
+_trace_owned = False
+
+
+def rss_mb():
+    # RSS proses saat ini dari /proc (Linux); None jika tidak tersedia
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _start_tracing():
+    global _trace_users, _trace_owned
+    with _trace_lock:
+        if _trace_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _trace_owned = True
+        _trace_users += 1
+
+
+def _stop_tracing():
+    global _trace_users, _trace_owned
+    with _trace_lock:
+        _trace_users -= 1
+        if _trace_users == 0 and _trace_owned:
+            tracemalloc.stop()
+            _trace_owned = False
+
+
+class StageMonitor:
+    # Mengukur satu tahap: waktu, RSS puncak (disampel thread latar, ikut menghitung alokasi
+    # C/Cython) dan, jika trace_memory=True, puncak alokasi tracemalloc. tracemalloc
+    # memperlambat kode Python 5-10%, jadi default-nya mati. Keduanya berlaku untuk seluruh
+    # proses, jadi tahap yang berjalan bersamaan di proses yang sama saling memengaruhi angkanya.
+    def __init__(self, interval=SAMPLE_INTERVAL, trace_memory=False):
+        self.interval = interval
+        self.trace_memory = trace_memory
+        self.seconds = None
+        self.rss_start_mb = self.rss_peak_mb = None
+        self.traced_peak_mb = None
+
+    def _sample(self):
+        while not self._stopped.wait(self.interval):
+            self._update_rss()
+
+    def _update_rss(self):
+        rss = rss_mb()
+        if rss is not None:
+            self.rss_peak_mb = rss if self.rss_peak_mb is None else max(self.rss_peak_mb, rss)
+
+    def __enter__(self):
+        if self.trace_memory:
+            _start_tracing()
+            tracemalloc.reset_peak()
+        self.rss_start_mb = self.rss_peak_mb = rss_mb()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name="stage-monitor", daemon=True)
+        self._thread.start()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self._start
+        if self.trace_memory:
+            self.traced_peak_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        self._stopped.set()
+        self._thread.join()
+        self._update_rss()
+        if self.trace_memory:
+            _stop_tracing()
+        return False
+
+    def as_dict(self):
+        delta = None
+        if self.rss_peak_mb is not None and self.rss_start_mb is not None:
+            delta = self.rss_peak_mb - self.rss_start_mb
+        return {
+            "seconds": self.seconds,
+            "rss_peak_mb": self.rss_peak_mb,
+            "rss_delta_mb": delta,
+            "traced_peak_mb": self.traced_peak_mb,
+        }
+
+
+def append_history(entry, path=HISTORY_PATH):
+    # Satu baris JSON per run, untuk membandingkan tren antar run
+    entry = {"timestamp": datetime.now().isoformat(timespec="seconds"), **entry}
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, default=str) + "\n")
+    return entry
+
+
+def _tail_lines(path, limit, block_size=64 * 1024):
+    # Membaca file dari belakang per blok sampai limit baris terkumpul, sehingga biaya
+    # tidak bergantung pada panjang riwayat
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+        while position > 0 and data.count(b"\n") <= limit:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    lines = data.splitlines()
+    if position > 0:
+        # Baris pertama mungkin terpotong di tengah blok
+        lines = lines[1:]
+    return lines[-limit:]
+
+
+def load_history(path=HISTORY_PATH, limit=None):
+    if not os.path.exists(path):
+        return []
+    if limit:
+        lines = _tail_lines(path, limit)
+    else:
+        with open(path, "rb") as f:
+            lines = f.read().splitlines()
+    entries = []
+    for line in lines:
+        try:
+            entries.append(json.loads(line.decode("utf-8")))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+    return entries
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from linear_svm import CalibratedLinearSVC
+
+
+def oversampled(minority_rows, majority_rows=20, seed=0):
+    # Meniru RandomOverSampler: baris kelas minoritas diulang sampai seimbang
+    rng = np.random.default_rng(seed)
+    X = [rng.random((majority_rows, 5)) + shift for shift in (0, 2)]
+    minority = rng.random((minority_rows, 5)) + 4
+    X.append(minority[np.arange(majority_rows) % minority_rows])
+    y = np.repeat(["Negatif", "Netral", "Positif"], majority_rows)
+    return sparse.csr_matrix(np.vstack(X)), y
+
+
+def test_grouped_split_uses_single_prefit_svm():
+    X, y = oversampled(minority_rows=10)
+    model = CalibratedLinearSVC().fit(X, y)
+    assert len(model.calibrated_.calibrated_classifiers_) == 1
+    assert list(model.classes_) == ["Negatif", "Netral", "Positif"]
+
+
+def test_minority_class_with_one_unique_row():
+    # Satu-satunya baris unik kelas Positif tidak bisa ada di data latih dan kalibrasi sekaligus
+    X, y = oversampled(minority_rows=1)
+    model = CalibratedLinearSVC().fit(X, y)
+    assert len(model.calibrated_.calibrated_classifiers_) == 3
+    proba = model.predict_proba(X)
+    assert proba.shape == (len(y), 3)
+    assert np.allclose(proba.sum(axis=1), 1)
+    assert model.decision_function(X).shape == (len(y), 3)
+    assert (model.predict(X[-1:]) == "Positif").all()
+
+
+def test_class_with_single_row_is_rejected():
+    X, y = oversampled(minority_rows=10)
+    X, y = X[:41], y[:41]
+    with pytest.raises(ValueError, match="minimal 2 baris"):
+        CalibratedLinearSVC().fit(X, y)
@@ -0,0 +1,82 @@
+import pytest
+
+import youtube_fake_server as fake
+from youtube_fetcher import YouTubeFetcher, parse_video_ids
+
+VIDEOS = ["vid00000001", "vid00000002", "vid00000003"]
+API_KEY = "test-key"
+
+
+@pytest.fixture(scope="module")
+def server():
+    # Beberapa utas sengaja punya balasan lebih banyak dari INLINE_REPLIES agar jalur
+    # pengambilan balasan lengkap (comments.list) ikut teruji
+    data = fake.make_dataset(VIDEOS, threads_per_video=230, max_replies=12, seed=7)
+    server = fake.create_server(data, api_key=API_KEY, port=0, disabled=["disabled001"])
+    fake.start_background(server)
+    yield server
+    fake.shutdown(server)
+
+
+def expected_ids(server, video_id, full_replies=True):
+    ids = set()
+    for thread in server.data[video_id]:
+        ids.add(thread["id"])
+        replies = thread["replies"] if full_replies else thread["replies"][:fake.INLINE_REPLIES]
+        ids.update(reply["id"] for reply in replies)
+    return ids
+
+
+def fetcher(server, api_key=API_KEY, **kwargs):
+    return YouTubeFetcher(api_key, api_endpoint=fake.endpoint(server), **kwargs)
+
+
+def test_fetches_all_comments_and_full_reply_threads(server):
+    assert any(len(t["replies"]) > fake.INLINE_REPLIES for t in server.data[VIDEOS[0]])
+    errors, counts = {}, {}
+    rows = fetcher(server, max_workers=4).fetch(VIDEOS, errors, counts)
+
+    assert errors == {}
+    ids = [row["Comment ID"] for row in rows]
+    assert len(ids) == len(set(ids))
+    for video_id in VIDEOS:
+        expected = expected_ids(server, video_id)
+        assert {row["Comment ID"] for row in rows if row["Video ID"] == video_id} == expected
+        assert counts[video_id] == len(expected)
+    replies = [row for row in rows if row["Parent ID"] is not None]
+    assert all(row["Comment ID"].startswith(row["Parent ID"] + ".") for row in replies)
+
+
+def test_inline_replies_only(server):
+    rows = fetcher(server, max_workers=2, full_replies=False).fetch(VIDEOS[:1])
+    assert {row["Comment ID"] for row in rows} == expected_ids(server, VIDEOS[0], full_replies=False)
+
+
+def test_failing_videos_do_not_affect_others(server):
+    errors, counts = {}, {}
+    rows = fetcher(server, max_workers=4).fetch([VIDEOS[0], "missing0001", "disabled001"], errors, counts)
+
+    assert errors == {"missing0001": "HTTP 404 (videoNotFound)", "disabled001": "HTTP 403 (commentsDisabled)"}
+    assert counts["missing0001"] == counts["disabled001"] == 0
+    assert {row["Comment ID"] for row in rows} == expected_ids(server, VIDEOS[0])
+
+
+def test_invalid_api_key(server):
+    errors = {}
+    rows = fetcher(server, api_key="wrong-key").fetch(VIDEOS[:2], errors)
+    assert rows == []
+    assert errors == {video_id: "HTTP 400 (keyInvalid)" for video_id in VIDEOS[:2]}
+
+
+def test_closing_generator_early(server):
+    stream = fetcher(server, max_workers=4).iter_comments(VIDEOS)
+    first = [next(stream) for _ in range(10)]
+    stream.close()
+    assert len(first) == 10
+    # Server tetap bisa dipakai setelah pemanggil berhenti membaca
+    assert fetcher(server).fetch(VIDEOS[1:2])
+
+
+def test_parse_video_ids():
+    text = "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=1s, youtu.be/dQw4w9WgXcQ\nabcdefghijk  shorts/ABCDEFGHIJK"
+    assert parse_video_ids(text) == ["dQw4w9WgXcQ", "abcdefghijk", "ABCDEFGHIJK"]
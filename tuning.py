@@ -0,0 +1,60 @@
+import time
+
+import numpy as np
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingGridSearchCV, StratifiedKFold
+from imblearn.pipeline import Pipeline as ImbPipeline
+from imblearn.over_sampling import RandomOverSampler
+
+from features import classification_scores
+
+# Grid per model; nama parameter mengikuti step "model" di pipeline tuning
+PARAM_GRIDS = {
+    'Naive Bayes': {'model__alpha': [0.01, 0.05, 0.1, 0.5, 1.0]},
+    'SVM': {'model__C': [0.1, 1, 10], 'model__kernel': ['linear', 'rbf']},
+    'SVM Linear': {'model__C': [0.05, 0.1, 0.5, 1, 2, 5]},
+    'SVM Linear (Kalibrasi)': {'model__C': [0.05, 0.1, 0.5, 1, 2, 5], 'model__method': ['sigmoid', 'isotonic']},
+    'Random Forest': {
+        'model__n_estimators': [100, 300],
+        'model__max_depth': [None, 50],
+        'model__min_samples_leaf': [1, 2],
+    },
+    'AdaBoost': {'model__n_estimators': [50, 100, 200], 'model__learning_rate': [0.5, 1.0]},
+    'KNN': {'model__n_neighbors': [3, 5, 11, 21], 'model__weights': ['uniform', 'distance']},
+    'KNN Cosine': {'model__n_neighbors': [3, 5, 11, 21], 'model__weights': ['uniform', 'distance']},
+    'KNN SVD': {'model__n_neighbors': [5, 11], 'model__n_components': [8, 16, 100]},
+}
+SCORING = 'f1_weighted'
+
+
+def tune_model(estimator, param_grid, X_train, y_train, X_test, y_test, cv=5, n_jobs=1,
+               factor=3, random_state=42):
+    # X_train adalah matriks TF-IDF yang sudah jadi (belum di-oversample): semua kandidat
+    # dan fold memakai matriks yang sama, TF-IDF tidak dihitung ulang. Oversampling
+    # dilakukan di dalam tiap fold agar baris duplikat tidak bocor ke fold validasi.
+    pipeline = ImbPipeline([
+        ("oversample", RandomOverSampler(random_state=random_state)),
+        ("model", estimator),
+    ])
+    search = HalvingGridSearchCV(
+        pipeline, param_grid,
+        cv=StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state),
+        scoring=SCORING, factor=factor, min_resources='exhaust',
+        n_jobs=n_jobs, random_state=random_state, refit=True, error_score=np.nan,
+    )
+    start = time.perf_counter()
+    search.fit(X_train, y_train)
+    seconds = time.perf_counter() - start
+
+    best = search.best_index_
+    results = search.cv_results_
+    return {
+        "best_estimator": search.best_estimator_,
+        "best_params": {k.replace("model__", ""): v for k, v in search.best_params_.items()},
+        "cv_mean": float(results["mean_test_score"][best]),
+        "cv_std": float(results["std_test_score"][best]),
+        "test_scores": classification_scores(y_test, search.best_estimator_.predict(X_test)),
+        "n_candidates": int(search.n_candidates_[0]),
+        "n_iterations": int(search.n_iterations_),
+        "seconds": seconds,
+    }
@@ -0,0 +1,210 @@
+import argparse
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+DEFAULT_API_KEY = "fake-key"
+# Jumlah balasan yang disertakan langsung di commentThreads, seperti API aslinya
+INLINE_REPLIES = 5
+MAX_PAGE_SIZE = 100
+WORDS = "bagus mantap jelek kecewa suka keren lambat cepat harga murah mahal admin tolong terima kasih".split()
+
+
+def make_dataset(video_ids, threads_per_video=50, max_replies=12, seed=42):
+    # Data sintetis deterministik: {video_id: [{"id", "comment", "replies": [...]}]}
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def comment(comment_id, author):
+        published = start + timedelta(minutes=rng.randrange(500_000))
+        return {
+            "kind": "youtube#comment",
+            "id": comment_id,
+            "snippet": {
+                "textDisplay": " ".join(rng.choices(WORDS, k=rng.randint(3, 12))),
+                "authorDisplayName": f"@{author}",
+                "likeCount": rng.randrange(100),
+                "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            },
+        }
+
+    data = {}
+    for video_id in video_ids:
+        threads = []
+        for t in range(threads_per_video):
+            thread_id = f"{video_id}.t{t}"
+            replies = [comment(f"{thread_id}.r{r}", f"user{rng.randrange(1000)}") for r in range(rng.randint(0, max_replies))]
+            threads.append({"id": thread_id, "comment": comment(thread_id, f"user{rng.randrange(1000)}"), "replies": replies})
+        data[video_id] = threads
+    return data
+
+
+def _page(items, page_token, max_results):
+    # pageToken berisi offset; API asli memakai token buram, klien cukup meneruskannya
+    offset = int(page_token or 0)
+    size = max(1, min(int(max_results or 20), MAX_PAGE_SIZE))
+    chunk = items[offset:offset + size]
+    next_token = str(offset + size) if offset + size < len(items) else None
+    return chunk, next_token
+
+
+class FakeYouTubeHandler(BaseHTTPRequestHandler):
+    server_version = "FakeYouTube/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, reason, message):
+        # Bentuk galat sama dengan API Google sehingga HttpError di klien terisi dengan benar
+        self._send_json(status, {"error": {"code": status, "message": message,
+                                           "errors": [{"reason": reason, "message": message}]}})
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        self.server.record_request(url.path)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if query.get("key") != self.server.api_key:
+            self._error(400, "keyInvalid", "API key not valid. Please pass a valid API key.")
+        elif url.path.endswith("/commentThreads"):
+            self._comment_threads(query)
+        elif url.path.endswith("/comments"):
+            self._comments(query)
+        else:
+            self._error(404, "notFound", "Not Found")
+
+    def _comment_threads(self, query):
+        video_id = query.get("videoId")
+        if video_id in self.server.disabled:
+            self._error(403, "commentsDisabled", "The video has disabled comments.")
+            return
+        threads = self.server.data.get(video_id)
+        if threads is None:
+            self._error(404, "videoNotFound", "The video identified by the videoId parameter could not be found.")
+            return
+        chunk, next_token = _page(threads, query.get("pageToken"), query.get("maxResults"))
+        with_replies = "replies" in query.get("part", "")
+        items = []
+        for thread in chunk:
+            item = {
+                "kind": "youtube#commentThread",
+                "id": thread["id"],
+                "snippet": {"videoId": video_id, "topLevelComment": thread["comment"],
+                            "totalReplyCount": len(thread["replies"]), "canReply": True},
+            }
+            if with_replies and thread["replies"]:
+                item["replies"] = {"comments": thread["replies"][:INLINE_REPLIES]}
+            items.append(item)
+        payload = {"kind": "youtube#commentThreadListResponse", "items": items}
+        if next_token:
+            payload["nextPageToken"] = next_token
+        self._send_json(200, payload)
+
+    def _comments(self, query):
+        replies = self.server.replies.get(query.get("parentId"))
+        if replies is None:
+            self._error(404, "commentNotFound", "The comment identified by the parentId parameter could not be found.")
+            return
+        chunk, next_token = _page(replies, query.get("pageToken"), query.get("maxResults"))
+        payload = {"kind": "youtube#commentListResponse", "items": chunk}
+        if next_token:
+            payload["nextPageToken"] = next_token
+        self._send_json(200, payload)
+
+
+class FakeYouTubeServer(ThreadingHTTPServer):
+    request_queue_size = 128
+    daemon_threads = True
+
+    def record_request(self, path):
+        endpoint = path.rsplit("/", 1)[-1]
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+    def finish_request(self, request, client_address):
+        try:
+            super().finish_request(request, client_address)
+        finally:
+            with self._lock:
+                self.active = max(0, self.active - 1)
+
+
+def create_server(data, api_key=DEFAULT_API_KEY, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                  latency_ms=0.0, disabled=(), verbose=False):
+    # port=0 memilih port bebas; endpoint untuk klien: http://host:port/
+    server = FakeYouTubeServer((host, port), FakeYouTubeHandler)
+    server.data = data
+    server.replies = {thread["id"]: thread["replies"] for threads in data.values() for thread in threads}
+    server.api_key = api_key
+    server.latency = latency_ms / 1000
+    server.disabled = set(disabled)
+    server.verbose = verbose
+    server.requests = {}
+    server.active = server.max_active = 0
+    server._lock = threading.Lock()
+    return server
+
+
+def endpoint(server):
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}/"
+
+
+def start_background(server):
+    thread = threading.Thread(target=server.serve_forever, name="fake-youtube", daemon=True)
+    thread.start()
+    return thread
+
+
+def shutdown(server):
+    server.shutdown()
+    server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Server palsu YouTube Data API v3 (commentThreads/comments) untuk pengujian lokal")
+    parser.add_argument("--videos", nargs="+", default=[f"video{i:06d}" for i in range(10)])
+    parser.add_argument("--threads-per-video", type=int, default=50)
+    parser.add_argument("--max-replies", type=int, default=12)
+    parser.add_argument("--disabled", nargs="*", default=[], help="ID video dengan komentar dinonaktifkan (403)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Jeda buatan per request")
+    parser.add_argument("--api-key", default=DEFAULT_API_KEY)
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    data = make_dataset(args.videos, args.threads_per_video, args.max_replies, args.seed)
+    server = create_server(data, args.api_key, args.host, args.port, args.latency_ms, args.disabled, args.verbose)
+    print(f"YouTube palsu siap di {endpoint(server)} (API key: {args.api_key}); "
+          f"set YOUTUBE_API_ENDPOINT={endpoint(server)}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
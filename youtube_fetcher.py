@@ -0,0 +1,223 @@
+import argparse
+import csv
+import os
+import queue
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_NUM_RETRIES = 3
+PAGE_SIZE = 100
+# Alamat API alternatif, mis. server palsu lokal (youtube_fake_server) untuk pengujian
+ENDPOINT_ENV = "YOUTUBE_API_ENDPOINT"
+COLUMNS = ["Komentar", "Tanggal", "User", "Likes", "Video ID", "Comment ID", "Parent ID"]
+
+_DONE = object()
+
+
+def parse_video_ids(text):
+    # Menerima ID atau URL video, dipisah baris baru, koma atau spasi; urutan dipertahankan
+    ids = []
+    for token in re.split(r"[\s,]+", text or ""):
+        match = re.search(r"(?:v=|youtu\.be/|shorts/|embed/)([\w-]{11})", token)
+        video_id = match.group(1) if match else token.strip()
+        if video_id and video_id not in ids:
+            ids.append(video_id)
+    return ids
+
+
+def error_message(error):
+    if isinstance(error, HttpError):
+        reason = error.error_details[0].get("reason") if error.error_details else None
+        return f"HTTP {error.resp.status}" + (f" ({reason})" if reason else "")
+    return f"{type(error).__name__}: {error}"
+
+
+def _row(video_id, comment, parent_id=None):
+    info = comment["snippet"]
+    return {
+        "Komentar": info["textDisplay"],
+        "Tanggal": info["publishedAt"],
+        "User": info["authorDisplayName"],
+        "Likes": info["likeCount"],
+        "Video ID": video_id,
+        "Comment ID": comment.get("id"),
+        "Parent ID": parent_id,
+    }
+
+
+class YouTubeFetcher:
+    # Mengambil komentar banyak video sekaligus. Setiap halaman commentThreads dan setiap
+    # utas balasan yang terpotong menjadi satu tugas di thread pool (maks. max_workers
+    # request bersamaan); baris dikirim ke pemanggil segera setelah halamannya diterima.
+    def __init__(self, api_key, max_workers=DEFAULT_MAX_WORKERS, api_endpoint=None,
+                 full_replies=True, num_retries=DEFAULT_NUM_RETRIES):
+        self.api_key = api_key
+        self.max_workers = max(1, int(max_workers))
+        self.api_endpoint = api_endpoint or os.environ.get(ENDPOINT_ENV)
+        self.full_replies = full_replies
+        self.num_retries = num_retries
+        self._local = threading.local()
+
+    def _service(self):
+        # Objek service (httplib2) tidak thread-safe, jadi dibuat satu per thread
+        service = getattr(self._local, "service", None)
+        if service is None:
+            options = {"api_endpoint": self.api_endpoint} if self.api_endpoint else None
+            service = build("youtube", "v3", developerKey=self.api_key, client_options=options,
+                            static_discovery=True, cache_discovery=False)
+            self._local.service = service
+        return service
+
+    def _threads_page(self, run, video_id, page_token=None):
+        response = self._service().commentThreads().list(
+            part="snippet,replies", videoId=video_id, maxResults=PAGE_SIZE, pageToken=page_token
+        ).execute(num_retries=self.num_retries)
+        if response.get("nextPageToken"):
+            run.submit(video_id, self._threads_page, run, video_id, response["nextPageToken"])
+
+        rows = []
+        for item in response.get("items", []):
+            try:
+                top = item["snippet"]["topLevelComment"]
+                rows.append(_row(video_id, top))
+                inline = item.get("replies", {}).get("comments", [])
+                total = item["snippet"].get("totalReplyCount", len(inline))
+                if self.full_replies and total > len(inline):
+                    # Respons commentThreads hanya menyertakan sebagian balasan
+                    run.submit(video_id, self._replies_page, run, video_id, top["id"])
+                else:
+                    rows.extend(_row(video_id, reply, top["id"]) for reply in inline)
+            except KeyError:
+                continue
+        run.emit(video_id, rows)
+
+    def _replies_page(self, run, video_id, parent_id, page_token=None):
+        response = self._service().comments().list(
+            part="snippet", parentId=parent_id, maxResults=PAGE_SIZE, pageToken=page_token
+        ).execute(num_retries=self.num_retries)
+        if response.get("nextPageToken"):
+            run.submit(video_id, self._replies_page, run, video_id, parent_id, response["nextPageToken"])
+        rows = []
+        for comment in response.get("items", []):
+            try:
+                rows.append(_row(video_id, comment, parent_id))
+            except KeyError:
+                continue
+        run.emit(video_id, rows)
+
+    def iter_comments(self, video_ids, errors=None, counts=None):
+        # Generator baris komentar dalam urutan kedatangan. Kegagalan per video dicatat di
+        # errors ({video_id: pesan}) tanpa menghentikan video lain; counts menghitung baris per video.
+        errors = {} if errors is None else errors
+        counts = {} if counts is None else counts
+        video_ids = list(dict.fromkeys(video_ids))
+        if not video_ids:
+            return
+        run = _Run(ThreadPoolExecutor(self.max_workers, thread_name_prefix="youtube"), errors, counts)
+        try:
+            for video_id in video_ids:
+                counts.setdefault(video_id, 0)
+                run.submit(video_id, self._threads_page, run, video_id)
+            run.seeded()
+            while True:
+                batch = run.rows.get()
+                if batch is _DONE:
+                    break
+                yield from batch
+        finally:
+            run.stop()
+
+    def fetch(self, video_ids, errors=None, counts=None):
+        return list(self.iter_comments(video_ids, errors, counts))
+
+
+class _Run:
+    # Status satu pemanggilan iter_comments: jumlah tugas yang belum selesai menentukan kapan selesai
+    def __init__(self, executor, errors, counts):
+        self.executor = executor
+        self.errors = errors
+        self.counts = counts
+        self.rows = queue.Queue()
+        # Dimulai dari 1 agar run tidak dianggap selesai sebelum semua video didaftarkan (lihat seeded)
+        self._pending = 1
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def submit(self, video_id, func, *args):
+        with self._lock:
+            self._pending += 1
+        try:
+            self.executor.submit(self._call, video_id, func, args)
+        except RuntimeError:
+            # Executor sudah ditutup karena pemanggil berhenti membaca
+            self._finish()
+
+    def _call(self, video_id, func, args):
+        try:
+            if not self._stopped.is_set():
+                func(*args)
+        except Exception as e:
+            with self._lock:
+                self.errors.setdefault(video_id, error_message(e))
+        finally:
+            self._finish()
+
+    def _finish(self):
+        with self._lock:
+            self._pending -= 1
+            done = self._pending == 0
+        if done:
+            self.rows.put(_DONE)
+
+    def seeded(self):
+        self._finish()
+
+    def emit(self, video_id, rows):
+        if rows:
+            with self._lock:
+                self.counts[video_id] = self.counts.get(video_id, 0) + len(rows)
+            self.rows.put(rows)
+
+    def stop(self):
+        self._stopped.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ambil komentar banyak video YouTube secara paralel ke CSV")
+    parser.add_argument("--api-key", default=os.environ.get("YOUTUBE_API_KEY"), help="Default: env YOUTUBE_API_KEY")
+    parser.add_argument("--videos", nargs="+", required=True, help="ID atau URL video")
+    parser.add_argument("--output", required=True, help="File CSV hasil (ditulis bertahap)")
+    parser.add_argument("--max-workers", type=int, default=DEFAULT_MAX_WORKERS)
+    parser.add_argument("--inline-replies-only", action="store_true", help="Jangan ambil utas balasan lengkap")
+    parser.add_argument("--endpoint", help=f"Alamat API alternatif (default: env {ENDPOINT_ENV})")
+    args = parser.parse_args(argv)
+    if not args.api_key:
+        parser.error("API key wajib diisi (--api-key atau env YOUTUBE_API_KEY)")
+
+    fetcher = YouTubeFetcher(args.api_key, args.max_workers, args.endpoint, not args.inline_replies_only)
+    errors, counts, total = {}, {}, 0
+    with open(args.output, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        for row in fetcher.iter_comments(parse_video_ids(" ".join(args.videos)), errors, counts):
+            writer.writerow(row)
+            total += 1
+            if total % 1000 == 0:
+                print(f"{total:,} komentar", file=sys.stderr, flush=True)
+
+    for video_id, count in counts.items():
+        status = f"GAGAL: {errors[video_id]}" if video_id in errors else "ok"
+        print(f"{video_id}: {count:,} komentar ({status})", file=sys.stderr)
+    print(f"{total:,} komentar dari {len(counts)} video -> {args.output}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())